@@ -8,25 +8,27 @@ import os
 import sys
 import sqlite3
 from datetime import datetime
+from importlib import import_module
+from importlib.util import find_spec
 from pathlib import Path
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
-def check_environment():
+def check_environment(lines):
     """检查环境配置"""
-    print("🔧 检查环境配置...")
+    lines.append("🔧 检查环境配置...")
     
     # 加载环境变量
     try:
         from dotenv import load_dotenv
         load_dotenv()
-        print("✅ .env 文件加载成功")
+        lines.append("✅ .env 文件加载成功")
     except ImportError:
-        print("⚠️ python-dotenv 未安装，尝试直接读取环境变量")
+        lines.append("⚠️ python-dotenv 未安装，尝试直接读取环境变量")
     except Exception as e:
-        print(f"⚠️ .env 文件加载失败: {e}")
+        lines.append(f"⚠️ .env 文件加载失败: {e}")
     
     required_vars = [
         'MCP_SERVER_URL', 'MCP_SERVER_TYPE', 'MCP_SERVER_NAME'
@@ -38,22 +40,20 @@ def check_environment():
         'CACHE_DYNAMIC_TTL': '300'
     }
     
-    missing = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing.append(var)
+    env = os.environ
+    missing = [var for var in required_vars if not env.get(var)]
     
     if missing:
-        print(f"❌ 缺少必需环境变量: {', '.join(missing)}")
-        print("💡 请检查 .env 文件配置")
+        lines.append(f"❌ 缺少必需环境变量: {', '.join(missing)}")
+        lines.append("💡 请检查 .env 文件配置")
         return False
     
-    print("✅ 必需环境变量配置正确")
+    lines.append("✅ 必需环境变量配置正确")
     
     # 显示配置信息
-    print("\n📋 当前配置:")
+    lines.append("\n📋 当前配置:")
     for var in required_vars:
-        value = os.getenv(var)
+        value = env.get(var)
         # 隐藏敏感信息
         if 'URL' in var and value:
             if len(value) > 20:
@@ -62,33 +62,36 @@ def check_environment():
                 display_value = value
         else:
             display_value = value
-        print(f"   {var}: {display_value}")
+        lines.append(f"   {var}: {display_value}")
     
     for var, default in optional_vars.items():
-        value = os.getenv(var, default)
-        print(f"   {var}: {value}")
+        value = env.get(var, default)
+        lines.append(f"   {var}: {value}")
     
     return True
 
-def check_database():
+def check_database(lines):
     """检查数据库状态"""
-    print("\n💾 检查数据库状态...")
+    lines.append("\n💾 检查数据库状态...")
     
     db_path = os.getenv('CACHE_DB_PATH', './data/k8s_cache.db')
     db_file = Path(db_path)
     
     if not db_file.exists():
-        print(f"⚠️ 数据库文件不存在: {db_path}")
-        print("💡 这是正常的，首次运行扫描时会自动创建")
+        lines.append(f"⚠️ 数据库文件不存在: {db_path}")
+        lines.append("💡 这是正常的，首次运行扫描时会自动创建")
         return True  # 这不是错误
     
-    print(f"✅ 数据库文件存在: {db_path}")
-    print(f"   文件大小: {db_file.stat().st_size / 1024:.1f} KB")
-    print(f"   修改时间: {datetime.fromtimestamp(db_file.stat().st_mtime)}")
+    lines.append(f"✅ 数据库文件存在: {db_path}")
+    db_stat = db_file.stat()
+    lines.append(f"   文件大小: {db_stat.st_size / 1024:.1f} KB")
+    lines.append(f"   修改时间: {datetime.fromtimestamp(db_stat.st_mtime)}")
     
     try:
-        conn = sqlite3.connect(db_path)
+        # 只读方式打开，不创建日志文件，也不会阻塞正在写入的扫描程序
+        conn = sqlite3.connect(f"{db_file.resolve().as_uri()}?mode=ro", uri=True)
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA mmap_size=268435456")
         cursor = conn.cursor()
         
         # 检查表是否存在
@@ -100,35 +103,38 @@ def check_database():
         tables = [row['name'] for row in cursor.fetchall()]
         
         if not tables:
-            print("⚠️ 数据库中没有表，可能需要初始化")
+            lines.append("⚠️ 数据库中没有表，可能需要初始化")
             return True  # 这也不是错误
         
-        print(f"✅ 数据库包含 {len(tables)} 个表: {', '.join(tables)}")
+        lines.append(f"✅ 数据库包含 {len(tables)} 个表: {', '.join(tables)}")
         
         # 检查数据统计
-        print("\n📊 数据统计:")
+        lines.append("\n📊 数据统计:")
         data_tables = ['clusters', 'namespaces', 'nodes', 'pods', 'services']
         total_records = 0
         
-        for table in data_tables:
-            if table in tables:
-                cursor.execute(f"SELECT COUNT(*) as count FROM {table}")
-                count = cursor.fetchone()['count']
-                total_records += count
-                print(f"   {table}: {count} 条记录")
+        table_set = frozenset(tables)
+        existing_tables = [table for table in data_tables if table in table_set]
+        if existing_tables:
+            # 一条UNION ALL语句统计所有表的记录数
+            for row in conn.execute(" UNION ALL ".join(
+                f"SELECT '{table}' AS name, COUNT(*) AS count FROM {table}" for table in existing_tables
+            )):
+                total_records += row['count']
+                lines.append(f"   {row['name']}: {row['count']} 条记录")
         
-        print(f"   总计: {total_records} 条记录")
+        lines.append(f"   总计: {total_records} 条记录")
         
         conn.close()
         return True
         
     except Exception as e:
-        print(f"❌ 数据库访问失败: {e}")
+        lines.append(f"❌ 数据库访问失败: {e}")
         return False
 
-def check_imports():
+def check_imports(lines):
     """检查关键模块导入"""
-    print("\n📦 检查模块导入...")
+    lines.append("\n📦 检查模块导入...")
     
     # 检查关键依赖
     dependencies = [
@@ -137,12 +143,14 @@ def check_imports():
         ('sqlite3', '内置模块')
     ]
     
+    # 顶层第三方依赖只定位模块而不执行模块代码，避免触发MCP/LLM等重量级初始化
     for module, package in dependencies:
         try:
-            __import__(module)
-            print(f"✅ {module} ({package})")
+            if find_spec(module) is None:
+                raise ImportError(module)
+            lines.append(f"✅ {module} ({package})")
         except ImportError:
-            print(f"❌ {module} ({package}) - 请安装: pip install {package}")
+            lines.append(f"❌ {module} ({package}) - 请安装: pip install {package}")
     
     # 检查项目模块
     project_modules = [
@@ -153,40 +161,44 @@ def check_imports():
         'src.mcp_tools'
     ]
     
-    print("\n🔧 检查项目模块:")
+    lines.append("\n🔧 检查项目模块:")
     all_imported = True
     
+    # 项目模块必须真实导入，才能发现模块内部的导入错误
     for module in project_modules:
         try:
-            __import__(module)
-            print(f"✅ {module}")
+            imported = import_module(module)
+            # 惰性导出的包 (PEP 562) 需逐个解析 __all__，否则子模块的导入错误会被隐藏
+            for name in getattr(imported, '__all__', ()):
+                getattr(imported, name)
+            lines.append(f"✅ {module}")
         except ImportError as e:
-            print(f"❌ {module} - {e}")
+            lines.append(f"❌ {module} - {e}")
             all_imported = False
     
     return all_imported
 
-def check_mcp_connection():
+def check_mcp_connection(lines):
     """检查MCP连接（基础测试）"""
-    print("\n🔗 检查MCP连接配置...")
+    lines.append("\n🔗 检查MCP连接配置...")
     
     mcp_url = os.getenv('MCP_SERVER_URL')
     mcp_type = os.getenv('MCP_SERVER_TYPE')
     
     if not mcp_url or not mcp_type:
-        print("❌ MCP配置不完整")
+        lines.append("❌ MCP配置不完整")
         return False
     
-    print(f"✅ MCP服务器类型: {mcp_type}")
+    lines.append(f"✅ MCP服务器类型: {mcp_type}")
     
     # 基础URL格式检查
     if mcp_type == 'sse':
         if not mcp_url.startswith(('http://', 'https://')):
-            print(f"⚠️ SSE类型的URL格式可能不正确: {mcp_url}")
+            lines.append(f"⚠️ SSE类型的URL格式可能不正确: {mcp_url}")
         else:
-            print(f"✅ URL格式正确")
+            lines.append(f"✅ URL格式正确")
     
-    print("💡 实际连接测试需要运行完整扫描程序")
+    lines.append("💡 实际连接测试需要运行完整扫描程序")
     return True
 
 def main():
@@ -205,38 +217,49 @@ def main():
     
     results = {}
     
+    # 每项检查的输出先收集到列表，检查结束后一次性输出
     for name, check_func in checks:
+        lines = []
         try:
-            results[name] = check_func()
+            results[name] = check_func(lines)
         except Exception as e:
-            print(f"❌ {name}检查失败: {e}")
+            lines.append(f"❌ {name}检查失败: {e}")
             results[name] = False
+        finally:
+            print("\n".join(lines))
     
     # 总结
-    print("\n" + "=" * 60)
-    print("📋 检查结果总结:")
-    print("=" * 60)
+    lines = [
+        "\n" + "=" * 60,
+        "📋 检查结果总结:",
+        "=" * 60,
+    ]
     
     passed = 0
     for name, result in results.items():
         status = "✅ 通过" if result else "❌ 失败"
-        print(f"   {name}: {status}")
+        lines.append(f"   {name}: {status}")
         if result:
             passed += 1
     
     success_rate = (passed / len(results)) * 100
-    print(f"\n🎯 总体状态: {passed}/{len(results)} 项通过 ({success_rate:.1f}%)")
+    lines.append(f"\n🎯 总体状态: {passed}/{len(results)} 项通过 ({success_rate:.1f}%)")
     
     if success_rate >= 75:
-        print("🎉 环境配置良好，可以运行扫描程序！")
-        print("\n💡 下一步操作:")
-        print("   运行扫描演示: uv run python script/run-scanner-demo.py")
+        lines += [
+            "🎉 环境配置良好，可以运行扫描程序！",
+            "\n💡 下一步操作:",
+            "   运行扫描演示: uv run python script/run-scanner-demo.py",
+        ]
     else:
-        print("❌ 环境配置存在问题，请解决后再运行")
-        print("\n🔧 建议操作:")
-        print("   1. 检查 .env 文件配置")
-        print("   2. 安装缺失的依赖包")
-        print("   3. 确认项目结构完整")
+        lines += [
+            "❌ 环境配置存在问题，请解决后再运行",
+            "\n🔧 建议操作:",
+            "   1. 检查 .env 文件配置",
+            "   2. 安装缺失的依赖包",
+            "   3. 确认项目结构完整",
+        ]
+    print("\n".join(lines))
 
 if __name__ == '__main__':
     main()
@@ -30,6 +30,7 @@ async def list_available_tools():
     print("🛠️ 列出MCP服务器可用工具")
     print("=" * 60)
     
+    mcp_client = None
     try:
         # 创建组件
         config = {
@@ -52,21 +53,13 @@ async def list_available_tools():
         )
         
         print("✅ 组件创建成功")
+
+        # 预先建立MCP会话，后续所有探测复用同一客户端与连接
+        await cluster_scanner.agent.initialize()
         
-        # 方法1：通过Agent询问可用工具
-        print("\n🔍 方法1：询问Agent可用工具...")
-        try:
-            result = await cluster_scanner.agent.run(
-                "请列出所有可用的K8s相关工具和命令", 
-                max_steps=30
-            )
-            print("✅ Agent响应:")
-            print(f"   {result}")
-        except Exception as e:
-            print(f"❌ Agent询问失败: {e}")
-        
-        # 方法2：通过工具加载器获取工具
-        print("\n🔍 方法2：通过工具加载器获取...")
+        # 方法1：通过工具加载器获取工具
+        print("\n🔍 方法1：通过工具加载器获取...")
+        tools = []
         try:
             tools = await tool_loader.load_tools()
             print(f"✅ 工具加载器找到 {len(tools)} 个工具:")
@@ -75,62 +68,50 @@ async def list_available_tools():
         except Exception as e:
             print(f"❌ 工具加载器失败: {e}")
         
-        # 方法3：测试常见的工具名称变体
-        print("\n🔍 方法3：测试常见工具名称...")
-        possible_tools = [
-            'GET_CLUSTER_INFO',
-            'LIST_NAMESPACES', 
-            'LIST_NODES',
-            'LIST_CORE_RESOURCES',
-            'LIST_PODS',
-            'LIST_SERVICES',
-            'get_cluster_info',
-            'list_namespaces',
-            'list_nodes',
-            'list_pods',
-            'list_services',
-            'k8s_cluster_info',
-            'k8s_namespaces',
-            'k8s_nodes',
-            'k8s_pods',
-            'k8s_services'
-        ]
-        
+        # 方法2：通过MCP协议的tools/list直接获取服务器工具目录
+        print("\n🔍 方法2：通过MCP协议获取工具列表...")
         working_tools = []
-        
-        for tool_name in possible_tools:
+        try:
+            sessions = mcp_client.get_all_active_sessions() or await mcp_client.create_all_sessions()
+
+            for server_name, session in sessions.items():
+                for tool in await session.list_tools():
+                    working_tools.append((server_name, tool))
+
+            print(f"\n🎯 找到 {len(working_tools)} 个可用工具:")
+            for server_name, tool in working_tools:
+                print(f"   ✅ {tool.name} ({server_name})")
+                print(f"      描述: {tool.description}")
+        except Exception as e:
+            print(f"❌ 工具列表获取失败: {e}")
+
+        # 确定性方法已拿到工具时，跳过代价高昂的Agent询问
+        if tools or working_tools:
+            print("\n⏭️  已获取工具列表，跳过Agent询问")
+        else:
+            # 方法3：通过Agent询问可用工具
+            print("\n🔍 方法3：询问Agent可用工具...")
             try:
                 result = await cluster_scanner.agent.run(
-                    f"使用 {tool_name} 工具获取信息", 
+                    "请列出所有可用的K8s相关工具和命令", 
                     max_steps=30
                 )
-                
-                # 检查是否是"找不到工具"的错误
-                if "无法找到" not in result and "找不到" not in result and "不存在" not in result:
-                    working_tools.append((tool_name, result[:100] + "..."))
-                    print(f"✅ {tool_name}: 工作正常")
-                else:
-                    print(f"❌ {tool_name}: 工具不存在")
-                    
+                print("✅ Agent响应:")
+                print(f"   {result}")
             except Exception as e:
-                print(f"❌ {tool_name}: 调用失败 - {e}")
-        
-        print(f"\n🎯 找到 {len(working_tools)} 个可用工具:")
-        for tool_name, response in working_tools:
-            print(f"   ✅ {tool_name}")
-            print(f"      响应: {response}")
-        
-        # 方法4：直接询问正确的工具名称
-        print("\n🔍 方法4：询问正确的工具名称...")
-        try:
-            result = await cluster_scanner.agent.run(
-                "我想获取K8s集群信息、命名空间列表、节点列表和Pod列表，请告诉我应该使用什么工具名称和参数", 
-                max_steps=30
-            )
-            print("✅ Agent建议:")
-            print(f"   {result}")
-        except Exception as e:
-            print(f"❌ 询问失败: {e}")
+                print(f"❌ Agent询问失败: {e}")
+
+            # 方法4：直接询问正确的工具名称
+            print("\n🔍 方法4：询问正确的工具名称...")
+            try:
+                result = await cluster_scanner.agent.run(
+                    "我想获取K8s集群信息、命名空间列表、节点列表和Pod列表，请告诉我应该使用什么工具名称和参数", 
+                    max_steps=30
+                )
+                print("✅ Agent建议:")
+                print(f"   {result}")
+            except Exception as e:
+                print(f"❌ 询问失败: {e}")
         
         print("\n" + "=" * 60)
         print("🎯 总结:")
@@ -143,6 +124,9 @@ async def list_available_tools():
         print(f"❌ 程序执行失败: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if mcp_client is not None:
+            await mcp_client.close_all_sessions()
 
 
 def main():
@@ -10,10 +10,78 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+# Pod阶段图标
+PHASE_ICONS = {
+    'Running': '🟢',
+    'Pending': '🟡',
+    'Failed': '🔴',
+    'Succeeded': '✅',
+    'Unknown': '❓'
+}
+
+# 扫描状态图标
+SCAN_STATUS_ICONS = {
+    'completed': '✅',
+    'running': '🔄',
+    'failed': '❌',
+    'pending': '⏳'
+}
+
+# 由SQLite判断记录是否过期，避免逐行解析时间字符串
+EXPIRED_COLUMN = "(ttl_expires_at < datetime('now')) AS expired"
+
+# 统计的表及其SQL片段 (表名不能参数化，预先生成固定语句以便复用SQLite语句缓存)
+STAT_TABLES = ['clusters', 'namespaces', 'nodes', 'pods', 'services', 'mcp_tools', 'cache_metadata']
+COUNT_SQL = {
+    table: f"SELECT '{table}' AS name, COUNT(*) AS count FROM {table}"
+    for table in STAT_TABLES
+}
+TTL_SQL = {
+    table: f"""
+        SELECT 
+            '{table}' AS name,
+            COUNT(*) as total,
+            COUNT(CASE WHEN ttl_expires_at < datetime('now') THEN 1 END) as expired,
+            COUNT(CASE WHEN ttl_expires_at < datetime('now') THEN 1 END) * 100.0 / NULLIF(COUNT(*), 0) as expired_pct
+        FROM {table}"""
+    for table in ['clusters', 'namespaces', 'nodes', 'pods', 'services', 'mcp_tools']
+}
+
+# 报表查询使用的连接参数：禁止写入，其余参数减少磁盘IO
+CONNECTION_PRAGMAS = [
+    "PRAGMA query_only=1",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+]
+
+def open_database(db_path):
+    """以只读方式打开缓存数据库，不修改扫描程序的数据库配置"""
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def load_table_columns(cursor):
+    """一次性读取所有表的列名，返回 {表名: 列名集合}"""
+    cursor.execute("""
+        SELECT m.name AS table_name, p.name AS column_name
+        FROM sqlite_master m, pragma_table_info(m.name) p
+        WHERE m.type = 'table'
+    """)
+    table_columns = {}
+    for row in cursor:
+        table_columns.setdefault(row['table_name'], set()).add(row['column_name'])
+    return table_columns
+
 def format_json_field(json_str):
     """格式化JSON字段显示"""
     if not json_str:
         return "无"
+    # 非对象/数组的普通值无需进入JSON解析器
+    if not isinstance(json_str, str) or json_str.lstrip()[:1] not in ('{', '['):
+        return str(json_str)[:50]
     try:
         data = json.loads(json_str)
         if isinstance(data, dict) and len(data) <= 3:
@@ -22,293 +90,230 @@ def format_json_field(json_str):
             return ", ".join(str(item) for item in data)
         else:
             return f"({len(data)} 项)" if isinstance(data, (dict, list)) else str(data)[:50]
-    except:
-        return str(json_str)[:50]
+    except ValueError:
+        return json_str[:50]
 
-def query_clusters(cursor):
-    """查询集群信息"""
-    print("🏢 集群信息:")
-    cursor.execute("""
+def build_pods_query(columns):
+    """根据pods表实际存在的列构建查询"""
+    base_columns = ['cluster_name', 'namespace', 'name', 'phase', 'node_name', 'created_at', 'ttl_expires_at']
+    available_columns = [col for col in base_columns if col in columns]
+
+    if 'restart_count' in columns:
+        available_columns.insert(-2, 'restart_count')  # 在created_at之前插入
+
+    if 'ttl_expires_at' in columns:
+        available_columns.append(EXPIRED_COLUMN)
+
+    return f"""
+        SELECT {', '.join(available_columns)}
+        FROM pods
+        ORDER BY created_at DESC
+        LIMIT 15
+    """
+
+def build_cache_metadata_query(columns):
+    """根据cache_metadata表实际存在的列构建查询"""
+    base_columns = ['table_name', 'cluster_name', 'scan_status', 'record_count',
+                   'last_scan_at', 'next_scan_at', 'error_message']
+    available_columns = [col for col in base_columns if col in columns]
+
+    if 'scan_duration_ms' in columns:
+        available_columns.append('scan_duration_ms')
+
+    return f"""
+        SELECT {', '.join(available_columns)}
+        FROM cache_metadata
+        ORDER BY last_scan_at DESC
+    """
+
+def build_mcp_tools_query(columns):
+    """根据mcp_tools表实际存在的列构建查询"""
+    base_columns = ['name', 'description', 'resource_types', 'operation_types', 'created_at']
+    available_columns = [col for col in base_columns if col in columns]
+
+    if 'ttl_expires_at' in columns:
+        available_columns.append('ttl_expires_at')
+        available_columns.append(EXPIRED_COLUMN)
+
+    return f"""
+        SELECT {', '.join(available_columns)}
+        FROM mcp_tools
+        ORDER BY name
+        LIMIT 10
+    """
+
+def format_cluster(cluster):
+    """格式化集群信息"""
+    status = "⚠️过期" if cluster['expired'] else "✅有效"
+    return [
+        f"   - {cluster['name']}: v{cluster['version']} ({cluster['node_count']} 节点) {status}",
+        f"     API服务器: {cluster['api_server']}",
+        f"     创建时间: {cluster['created_at']}",
+    ]
+
+def format_namespace(ns):
+    """格式化命名空间信息"""
+    status_icon = "⚠️" if ns['expired'] else "✅"
+    labels = format_json_field(ns['labels'])
+    return [
+        f"   {status_icon} {ns['cluster_name']}/{ns['name']}: {ns['status']}",
+        f"     标签: {labels}",
+    ]
+
+def format_node(node):
+    """格式化节点信息"""
+    status_icon = "⚠️" if node['expired'] else "✅"
+    roles = format_json_field(node['roles'])
+    capacity = format_json_field(node['capacity'])
+    return [
+        f"   {status_icon} {node['cluster_name']}/{node['name']}: {node['status']}",
+        f"     角色: {roles}",
+        f"     容量: {capacity}",
+    ]
+
+def format_pod(pod):
+    """格式化Pod信息"""
+    status_icon = "⚠️" if pod.get('expired') else "✅"
+    phase_icon = PHASE_ICONS.get(pod.get('phase', 'Unknown'), '❓')
+
+    restart_info = f" | 重启: {pod['restart_count']}" if 'restart_count' in pod else ""
+
+    return [
+        f"   {status_icon} {pod['cluster_name']}/{pod['namespace']}/{pod['name']}",
+        f"     {phase_icon} {pod.get('phase', 'Unknown')} | 节点: {pod.get('node_name', 'Unknown')}{restart_info}",
+    ]
+
+def format_service(svc):
+    """格式化服务信息"""
+    status_icon = "⚠️" if svc['expired'] else "✅"
+    external = f" | 外部IP: {svc['external_ip']}" if svc['external_ip'] else ""
+    return [
+        f"   {status_icon} {svc['cluster_name']}/{svc['namespace']}/{svc['name']}",
+        f"     类型: {svc['type']} | 集群IP: {svc['cluster_ip']}{external}",
+    ]
+
+def format_mcp_tool(tool):
+    """格式化MCP工具信息"""
+    # 检查是否有TTL字段
+    status_icon = "⚠️" if tool.get('expired') else "✅"
+
+    return [
+        f"   {status_icon} {tool.get('name', 'Unknown')}",
+        f"     描述: {tool.get('description', '无描述')}",
+        f"     资源类型: {format_json_field(tool.get('resource_types'))}",
+        f"     操作类型: {format_json_field(tool.get('operation_types'))}",
+    ]
+
+def format_cache_metadata(meta):
+    """格式化缓存元数据"""
+    status_icon = SCAN_STATUS_ICONS.get(meta['scan_status'], '❓')
+
+    lines = [
+        f"   {status_icon} {meta['table_name']} ({meta['cluster_name']})",
+        f"     状态: {meta['scan_status']} | 记录数: {meta['record_count']}",
+        f"     最后扫描: {meta['last_scan_at']}",
+    ]
+    if meta.get('next_scan_at'):
+        lines.append(f"     下次扫描: {meta['next_scan_at']}")
+    if meta.get('error_message'):
+        lines.append(f"     错误: {meta['error_message']}")
+    if meta.get('scan_duration_ms'):
+        lines.append(f"     耗时: {meta['scan_duration_ms']}ms")
+    return lines
+
+# 资源查询描述表: (标题, 表名, SQL或按列构建SQL的函数, 行格式化函数, 无数据提示)
+RESOURCE_QUERIES = [
+    ("🏢 集群信息:", 'clusters', f"""
         SELECT name, version, api_server, node_count, 
-               created_at, ttl_expires_at
+               created_at, ttl_expires_at, {EXPIRED_COLUMN}
         FROM clusters 
         ORDER BY created_at DESC
-    """)
-    
-    clusters = cursor.fetchall()
-    if not clusters:
-        print("   无集群数据")
-        return
-    
-    for cluster in clusters:
-        expired = datetime.fromisoformat(cluster['ttl_expires_at'].replace('Z', '+00:00')) < datetime.now()
-        status = "⚠️过期" if expired else "✅有效"
-        print(f"   - {cluster['name']}: v{cluster['version']} ({cluster['node_count']} 节点) {status}")
-        print(f"     API服务器: {cluster['api_server']}")
-        print(f"     创建时间: {cluster['created_at']}")
-
-def query_namespaces(cursor):
-    """查询命名空间信息"""
-    print("\n📁 命名空间信息:")
-    cursor.execute("""
+    """, format_cluster, "无集群数据"),
+    ("\n📁 命名空间信息:", 'namespaces', f"""
         SELECT cluster_name, name, status, labels,
-               created_at, ttl_expires_at
+               created_at, ttl_expires_at, {EXPIRED_COLUMN}
         FROM namespaces 
         ORDER BY cluster_name, name
         LIMIT 10
-    """)
-    
-    namespaces = cursor.fetchall()
-    if not namespaces:
-        print("   无命名空间数据")
-        return
-    
-    for ns in namespaces:
-        expired = datetime.fromisoformat(ns['ttl_expires_at'].replace('Z', '+00:00')) < datetime.now()
-        status_icon = "⚠️" if expired else "✅"
-        labels = format_json_field(ns['labels'])
-        print(f"   {status_icon} {ns['cluster_name']}/{ns['name']}: {ns['status']}")
-        print(f"     标签: {labels}")
-
-def query_nodes(cursor):
-    """查询节点信息"""
-    print("\n🖥️  节点信息:")
-    cursor.execute("""
+    """, format_namespace, "无命名空间数据"),
+    ("\n🖥️  节点信息:", 'nodes', f"""
         SELECT cluster_name, name, status, roles, capacity,
-               created_at, ttl_expires_at
+               created_at, ttl_expires_at, {EXPIRED_COLUMN}
         FROM nodes 
         ORDER BY cluster_name, name
         LIMIT 10
-    """)
-    
-    nodes = cursor.fetchall()
-    if not nodes:
-        print("   无节点数据")
-        return
-    
-    for node in nodes:
-        expired = datetime.fromisoformat(node['ttl_expires_at'].replace('Z', '+00:00')) < datetime.now()
-        status_icon = "⚠️" if expired else "✅"
-        roles = format_json_field(node['roles'])
-        capacity = format_json_field(node['capacity'])
-        print(f"   {status_icon} {node['cluster_name']}/{node['name']}: {node['status']}")
-        print(f"     角色: {roles}")
-        print(f"     容量: {capacity}")
-
-def query_pods(cursor):
-    """查询Pod信息"""
-    print("\n🐳 Pod信息:")
-
-    # 首先检查表结构
-    try:
-        cursor.execute("PRAGMA table_info(pods)")
-        columns = [row[1] for row in cursor.fetchall()]
-
-        # 根据实际存在的列构建查询
-        base_columns = ['cluster_name', 'namespace', 'name', 'phase', 'node_name', 'created_at', 'ttl_expires_at']
-        available_columns = [col for col in base_columns if col in columns]
-
-        if 'restart_count' in columns:
-            available_columns.insert(-2, 'restart_count')  # 在created_at之前插入
-
-        query = f"""
-            SELECT {', '.join(available_columns)}
-            FROM pods
-            ORDER BY created_at DESC
-            LIMIT 15
-        """
-        cursor.execute(query)
-    except Exception as e:
-        print(f"   ❌ 查询Pod信息失败: {e}")
-        return
-    
-    pods = cursor.fetchall()
-    if not pods:
-        print("   无Pod数据")
-        return
-
-    for pod in pods:
-        try:
-            expired = datetime.fromisoformat(pod['ttl_expires_at'].replace('Z', '+00:00')) < datetime.now()
-        except:
-            expired = False
-
-        status_icon = "⚠️" if expired else "✅"
-        phase_icon = {
-            'Running': '🟢',
-            'Pending': '🟡',
-            'Failed': '🔴',
-            'Succeeded': '✅',
-            'Unknown': '❓'
-        }.get(pod.get('phase', 'Unknown'), '❓')
-
-        restart_info = f" | 重启: {pod['restart_count']}" if 'restart_count' in pod.keys() else ""
-
-        print(f"   {status_icon} {pod['cluster_name']}/{pod['namespace']}/{pod['name']}")
-        print(f"     {phase_icon} {pod.get('phase', 'Unknown')} | 节点: {pod.get('node_name', 'Unknown')}{restart_info}")
-
-def query_services(cursor):
-    """查询服务信息"""
-    print("\n🌐 服务信息:")
-    cursor.execute("""
+    """, format_node, "无节点数据"),
+    ("\n🐳 Pod信息:", 'pods', build_pods_query, format_pod, "无Pod数据"),
+    ("\n🌐 服务信息:", 'services', f"""
         SELECT cluster_name, namespace, name, type, cluster_ip,
-               external_ip, created_at, ttl_expires_at
+               external_ip, created_at, ttl_expires_at, {EXPIRED_COLUMN}
         FROM services 
         ORDER BY cluster_name, namespace, name
         LIMIT 10
-    """)
-    
-    services = cursor.fetchall()
-    if not services:
-        print("   无服务数据")
-        return
-    
-    for svc in services:
-        expired = datetime.fromisoformat(svc['ttl_expires_at'].replace('Z', '+00:00')) < datetime.now()
-        status_icon = "⚠️" if expired else "✅"
-        external = f" | 外部IP: {svc['external_ip']}" if svc['external_ip'] else ""
-        print(f"   {status_icon} {svc['cluster_name']}/{svc['namespace']}/{svc['name']}")
-        print(f"     类型: {svc['type']} | 集群IP: {svc['cluster_ip']}{external}")
-
-def query_cache_metadata(cursor):
-    """查询缓存元数据"""
-    print("\n📊 缓存元数据:")
-
-    # 检查表结构
-    try:
-        cursor.execute("PRAGMA table_info(cache_metadata)")
-        columns = [row[1] for row in cursor.fetchall()]
-
-        base_columns = ['table_name', 'cluster_name', 'scan_status', 'record_count',
-                       'last_scan_at', 'next_scan_at', 'error_message']
-        available_columns = [col for col in base_columns if col in columns]
-
-        if 'scan_duration_ms' in columns:
-            available_columns.append('scan_duration_ms')
-
-        query = f"""
-            SELECT {', '.join(available_columns)}
-            FROM cache_metadata
-            ORDER BY last_scan_at DESC
-        """
-        cursor.execute(query)
-    except Exception as e:
-        print(f"   ❌ 查询缓存元数据失败: {e}")
-        return
-    
-    metadata = cursor.fetchall()
-    if not metadata:
-        print("   无缓存元数据")
-        return
-    
-    for meta in metadata:
-        status_icon = {
-            'completed': '✅',
-            'running': '🔄',
-            'failed': '❌',
-            'pending': '⏳'
-        }.get(meta['scan_status'], '❓')
-        
-        print(f"   {status_icon} {meta['table_name']} ({meta['cluster_name']})")
-        print(f"     状态: {meta['scan_status']} | 记录数: {meta['record_count']}")
-        print(f"     最后扫描: {meta['last_scan_at']}")
-        if meta.get('next_scan_at'):
-            print(f"     下次扫描: {meta['next_scan_at']}")
-        if meta.get('error_message'):
-            print(f"     错误: {meta['error_message']}")
-        if 'scan_duration_ms' in meta.keys() and meta['scan_duration_ms']:
-            print(f"     耗时: {meta['scan_duration_ms']}ms")
-
-def query_mcp_tools(cursor):
-    """查询MCP工具信息"""
-    print("\n🛠️  MCP工具:")
-
-    # 检查表结构
-    try:
-        cursor.execute("PRAGMA table_info(mcp_tools)")
-        columns = [row[1] for row in cursor.fetchall()]
-
-        base_columns = ['name', 'description', 'resource_types', 'operation_types', 'created_at']
-        available_columns = [col for col in base_columns if col in columns]
-
-        if 'ttl_expires_at' in columns:
-            available_columns.append('ttl_expires_at')
-
-        query = f"""
-            SELECT {', '.join(available_columns)}
-            FROM mcp_tools
-            ORDER BY name
-            LIMIT 10
-        """
-        cursor.execute(query)
-    except Exception as e:
-        print(f"   ❌ 查询MCP工具失败: {e}")
-        return
-    
-    tools = cursor.fetchall()
-    if not tools:
-        print("   无MCP工具数据")
-        return
+    """, format_service, "无服务数据"),
+    ("\n🛠️  MCP工具:", 'mcp_tools', build_mcp_tools_query, format_mcp_tool, "无MCP工具数据"),
+    ("\n📊 缓存元数据:", 'cache_metadata', build_cache_metadata_query, format_cache_metadata, "无缓存元数据"),
+]
 
-    for tool in tools:
-        # 检查是否有TTL字段
+def query_resources(cursor, table_columns):
+    """按描述表依次查询各类资源，每类资源收集完毕后一次性输出"""
+    for title, table, query, format_row, empty_message in RESOURCE_QUERIES:
+        lines = [title]
         try:
-            if hasattr(tool, 'keys') and 'ttl_expires_at' in tool.keys() and tool['ttl_expires_at']:
-                expired = datetime.fromisoformat(tool['ttl_expires_at'].replace('Z', '+00:00')) < datetime.now()
-                status_icon = "⚠️" if expired else "✅"
-            else:
-                status_icon = "✅"
-        except:
-            status_icon = "✅"
-
-        # 安全获取字段值
-        name = tool['name'] if hasattr(tool, '__getitem__') else getattr(tool, 'name', 'Unknown')
-        description = tool.get('description', '无描述') if hasattr(tool, 'get') else getattr(tool, 'description', '无描述')
-        resource_types = format_json_field(tool.get('resource_types') if hasattr(tool, 'get') else getattr(tool, 'resource_types', None))
-        operation_types = format_json_field(tool.get('operation_types') if hasattr(tool, 'get') else getattr(tool, 'operation_types', None))
-
-        print(f"   {status_icon} {name}")
-        print(f"     描述: {description}")
-        print(f"     资源类型: {resource_types}")
-        print(f"     操作类型: {operation_types}")
-
-def show_statistics(cursor):
+            if callable(query):
+                query = query(table_columns.get(table, set()))
+            cursor.execute(query)
+        except sqlite3.Error as e:
+            lines.append(f"   ❌ 查询{table}失败: {e}")
+            print("\n".join(lines))
+            continue
+
+        # 逐行读取游标，无需先将整个结果集载入内存
+        row_count = 0
+        for row in cursor:
+            row_count += 1
+            lines.extend(format_row(dict(row)))
+
+        if not row_count:
+            lines.append(f"   {empty_message}")
+        print("\n".join(lines))
+
+def show_statistics(cursor, table_columns):
     """显示统计信息"""
-    print("\n📈 数据库统计:")
+    lines = ["\n📈 数据库统计:"]
     
-    tables = ['clusters', 'namespaces', 'nodes', 'pods', 'services', 'mcp_tools', 'cache_metadata']
     total_records = 0
-    
-    for table in tables:
-        try:
-            cursor.execute(f"SELECT COUNT(*) as count FROM {table}")
-            count = cursor.fetchone()['count']
+
+    # 只统计存在的表，用一条UNION ALL语句统计所有表的记录数
+    existing_tables = [table for table in STAT_TABLES if table in table_columns]
+
+    counts = {}
+    if existing_tables:
+        cursor.execute(" UNION ALL ".join(COUNT_SQL[table] for table in existing_tables))
+        counts = {row['name']: row['count'] for row in cursor.fetchall()}
+
+    for table in STAT_TABLES:
+        if table in counts:
+            count = counts[table]
             total_records += count
-            print(f"   {table}: {count} 条记录")
-        except sqlite3.OperationalError:
-            print(f"   {table}: 表不存在")
+            lines.append(f"   {table}: {count} 条记录")
+        else:
+            lines.append(f"   {table}: 表不存在")
     
-    print(f"   总计: {total_records} 条记录")
+    lines.append(f"   总计: {total_records} 条记录")
+    print("\n".join(lines))
     
     # TTL统计
-    print("\n⏰ TTL状态统计:")
-    ttl_tables = ['clusters', 'namespaces', 'nodes', 'pods', 'services', 'mcp_tools']
-    
-    for table in ttl_tables:
-        try:
-            cursor.execute(f"""
-                SELECT 
-                    COUNT(*) as total,
-                    COUNT(CASE WHEN ttl_expires_at < datetime('now') THEN 1 END) as expired
-                FROM {table}
-            """)
-            result = cursor.fetchone()
+    lines = ["\n⏰ TTL状态统计:"]
+    ttl_tables = [table for table in TTL_SQL if 'ttl_expires_at' in table_columns.get(table, ())]
+    if ttl_tables:
+        cursor.execute(" UNION ALL ".join(TTL_SQL[table] for table in ttl_tables))
+
+        for result in cursor.fetchall():
             if result['total'] > 0:
-                expired_pct = (result['expired'] / result['total']) * 100
-                status = "⚠️" if expired_pct > 50 else "✅"
-                print(f"   {status} {table}: {result['total'] - result['expired']} 有效, {result['expired']} 过期")
-        except sqlite3.OperationalError:
-            continue
+                status = "⚠️" if result['expired_pct'] > 50 else "✅"
+                lines.append(f"   {status} {result['name']}: {result['total'] - result['expired']} 有效, {result['expired']} 过期")
+    print("\n".join(lines))
 
 def main():
     """主函数"""
@@ -326,23 +331,18 @@ def main():
         return
     
     print(f"📁 数据库文件: {db_path}")
-    print(f"📏 文件大小: {db_file.stat().st_size / 1024:.1f} KB")
-    print(f"🕒 修改时间: {datetime.fromtimestamp(db_file.stat().st_mtime)}")
+    db_stat = db_file.stat()
+    print(f"📏 文件大小: {db_stat.st_size / 1024:.1f} KB")
+    print(f"🕒 修改时间: {datetime.fromtimestamp(db_stat.st_mtime)}")
     
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = open_database(db_path)
         cursor = conn.cursor()
         
         # 执行查询
-        show_statistics(cursor)
-        query_clusters(cursor)
-        query_namespaces(cursor)
-        query_nodes(cursor)
-        query_pods(cursor)
-        query_services(cursor)
-        query_mcp_tools(cursor)
-        query_cache_metadata(cursor)
+        table_columns = load_table_columns(cursor)
+        show_statistics(cursor, table_columns)
+        query_resources(cursor, table_columns)
         
         conn.close()
         
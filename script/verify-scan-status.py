@@ -7,13 +7,34 @@ K8s集群扫描状态验证脚本
 import os
 import sys
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 # 添加src目录到Python路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
+# 各检查步骤共享的只读数据库连接
+_connection = None
+
+def get_connection(db_path):
+    """获取共享的只读数据库连接，首次调用时打开"""
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+        _connection.row_factory = sqlite3.Row
+        for pragma in ("PRAGMA query_only=1", "PRAGMA cache_size=-20000",
+                       "PRAGMA temp_store=MEMORY", "PRAGMA mmap_size=268435456"):
+            _connection.execute(pragma)
+    return _connection
+
+def close_connection():
+    """关闭共享的数据库连接"""
+    global _connection
+    if _connection is not None:
+        _connection.close()
+        _connection = None
+
 def check_environment():
     """检查环境配置"""
     print("🔧 检查环境配置...")
@@ -32,10 +53,8 @@ def check_environment():
         'CACHE_DYNAMIC_TTL': '300'
     }
     
-    missing = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing.append(var)
+    env = os.environ
+    missing = [var for var in required_vars if not env.get(var)]
     
     if missing:
         print(f"❌ 缺少必需环境变量: {', '.join(missing)}")
@@ -47,10 +66,10 @@ def check_environment():
     # 显示配置信息
     print("\n📋 当前配置:")
     for var in required_vars:
-        print(f"   {var}: {os.getenv(var)}")
+        print(f"   {var}: {env.get(var)}")
     
     for var, default in optional_vars.items():
-        value = os.getenv(var, default)
+        value = env.get(var, default)
         print(f"   {var}: {value}")
     
     return True
@@ -68,12 +87,12 @@ def check_database():
         return False
     
     print(f"✅ 数据库文件存在: {db_path}")
-    print(f"   文件大小: {db_file.stat().st_size / 1024:.1f} KB")
-    print(f"   修改时间: {datetime.fromtimestamp(db_file.stat().st_mtime)}")
+    db_stat = db_file.stat()
+    print(f"   文件大小: {db_stat.st_size / 1024:.1f} KB")
+    print(f"   修改时间: {datetime.fromtimestamp(db_stat.st_mtime)}")
     
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = get_connection(db_path)
         cursor = conn.cursor()
         
         # 检查表是否存在
@@ -95,17 +114,20 @@ def check_database():
         data_tables = ['clusters', 'namespaces', 'nodes', 'pods', 'services']
         total_records = 0
         
-        for table in data_tables:
-            if table in tables:
-                cursor.execute(f"SELECT COUNT(*) as count FROM {table}")
-                count = cursor.fetchone()['count']
-                total_records += count
-                print(f"   {table}: {count} 条记录")
+        table_set = frozenset(tables)
+        existing_tables = [table for table in data_tables if table in table_set]
+        if existing_tables:
+            # 一条UNION ALL语句统计所有表的记录数
+            for row in conn.execute(" UNION ALL ".join(
+                f"SELECT '{table}' AS name, COUNT(*) AS count FROM {table}" for table in existing_tables
+            )):
+                total_records += row['count']
+                print(f"   {row['name']}: {row['count']} 条记录")
         
         print(f"   总计: {total_records} 条记录")
         
         # 检查缓存元数据
-        if 'cache_metadata' in tables:
+        if 'cache_metadata' in table_set:
             cursor.execute("""
                 SELECT table_name, scan_status, last_scan_at
                 FROM cache_metadata
@@ -122,7 +144,6 @@ def check_database():
                     if meta['last_scan_at']:
                         print(f"      最后扫描: {meta['last_scan_at']}")
         
-        conn.close()
         return True
         
     except Exception as e:
@@ -136,33 +157,33 @@ def check_ttl_status():
     db_path = os.getenv('CACHE_DB_PATH', './data/k8s_cache.db')
     
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = get_connection(db_path).cursor()
         
         tables_with_ttl = ['clusters', 'namespaces', 'nodes', 'pods', 'services']
-        
-        for table in tables_with_ttl:
-            try:
-                cursor.execute(f"""
-                    SELECT 
-                        COUNT(*) as total,
-                        COUNT(CASE WHEN ttl_expires_at < datetime('now') THEN 1 END) as expired,
-                        COUNT(CASE WHEN ttl_expires_at >= datetime('now') THEN 1 END) as valid
-                    FROM {table}
-                """)
-                
-                result = cursor.fetchone()
+
+        # 只统计存在且包含TTL列的表 (表可能不存在)
+        cursor.execute("""
+            SELECT name FROM sqlite_master
+            WHERE type='table' AND sql LIKE '%ttl_expires_at%'
+        """)
+        existing = {row['name'] for row in cursor.fetchall()}
+        tables = [table for table in tables_with_ttl if table in existing]
+
+        if tables:
+            # 一条UNION ALL语句统计所有表，当前时间只计算一次并绑定为参数
+            cursor.execute(" UNION ALL ".join(f"""
+                SELECT 
+                    '{table}' AS name,
+                    COUNT(*) as total,
+                    COUNT(CASE WHEN ttl_expires_at < :now THEN 1 END) as expired,
+                    COUNT(CASE WHEN ttl_expires_at >= :now THEN 1 END) as valid,
+                    COUNT(CASE WHEN ttl_expires_at < :now THEN 1 END) * 100.0 / NULLIF(COUNT(*), 0) as expired_pct
+                FROM {table}""" for table in tables), {'now': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')})
+
+            for result in cursor.fetchall():
                 if result['total'] > 0:
-                    expired_pct = (result['expired'] / result['total']) * 100
-                    status_icon = "⚠️" if expired_pct > 50 else "✅"
-                    print(f"   {status_icon} {table}: {result['valid']} 有效, {result['expired']} 过期 ({expired_pct:.1f}%)")
-                
-            except sqlite3.OperationalError:
-                # 表可能不存在
-                continue
-        
-        conn.close()
+                    status_icon = "⚠️" if result['expired_pct'] > 50 else "✅"
+                    print(f"   {status_icon} {result['name']}: {result['valid']} 有效, {result['expired']} 过期 ({result['expired_pct']:.1f}%)")
         
     except Exception as e:
         print(f"❌ TTL检查失败: {e}")
@@ -199,9 +220,7 @@ def run_quick_scan_test():
     print("\n🧪 运行快速扫描测试...")
     
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        
+        # .env 已在环境配置检查中加载
         # 检查是否可以创建扫描组件
         from src.cache import CacheManager
         from src.scanner import ResourceParser
@@ -238,12 +257,15 @@ def main():
     
     results = {}
     
-    for name, check_func in checks:
-        try:
-            results[name] = check_func()
-        except Exception as e:
-            print(f"❌ {name}检查失败: {e}")
-            results[name] = False
+    try:
+        for name, check_func in checks:
+            try:
+                results[name] = check_func()
+            except Exception as e:
+                print(f"❌ {name}检查失败: {e}")
+                results[name] = False
+    finally:
+        close_connection()
     
     # 总结
     print("\n" + "=" * 60)
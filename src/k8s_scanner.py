@@ -7,8 +7,8 @@ K8s集群扫描器 - 生产级应用程序
 import asyncio
 import argparse
 import sys
+import traceback
 from pathlib import Path
-from dotenv import load_dotenv
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent
@@ -16,6 +16,7 @@ sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / 'src'))
 
 from src.cache.cache_manager import CacheManager
+from src.llm_config import load_env
 from src.scanner.tool_discovery import ToolDiscovery
 from src.scanner.cluster_scan_app import ClusterScanApp
 from src.scanner.real_cluster_scan_app import RealClusterScanApp
@@ -117,7 +118,8 @@ class K8sScanner:
     
     async def show_scan_summary(self):
         """显示扫描结果摘要"""
-        print("\n📊 扫描结果摘要:")
+        # 先收集所有行再一次性输出，减少stdout写入次数
+        lines = ["\n📊 扫描结果摘要:"]
         
         try:
             # 查询各类资源数量
@@ -128,74 +130,84 @@ class K8sScanner:
             services = self.cache_manager.list_records('services')
             tools = self.cache_manager.list_records('mcp_tools')
             
-            print(f"   🏢 集群: {len(clusters)} 个")
-            print(f"   📁 命名空间: {len(namespaces)} 个")
-            print(f"   🖥️ 节点: {len(nodes)} 个")
-            print(f"   🐳 Pod: {len(pods)} 个")
-            print(f"   🌐 服务: {len(services)} 个")
-            print(f"   🛠️ MCP工具: {len(tools)} 个")
-            
             total_resources = len(clusters) + len(namespaces) + len(nodes) + len(pods) + len(services)
-            print(f"   📦 总资源: {total_resources} 个")
+            lines += [
+                f"   🏢 集群: {len(clusters)} 个",
+                f"   📁 命名空间: {len(namespaces)} 个",
+                f"   🖥️ 节点: {len(nodes)} 个",
+                f"   🐳 Pod: {len(pods)} 个",
+                f"   🌐 服务: {len(services)} 个",
+                f"   🛠️ MCP工具: {len(tools)} 个",
+                f"   📦 总资源: {total_resources} 个",
+            ]
             
             # 显示最新的集群信息
             if clusters:
                 latest_cluster = clusters[0]
-                print(f"\n🏢 最新集群信息:")
-                print(f"   - 名称: {latest_cluster.name}")
-                print(f"   - 版本: {latest_cluster.version}")
-                print(f"   - 节点数: {latest_cluster.node_count}")
-                print(f"   - API服务器: {latest_cluster.api_server}")
+                lines += [
+                    f"\n🏢 最新集群信息:",
+                    f"   - 名称: {latest_cluster.name}",
+                    f"   - 版本: {latest_cluster.version}",
+                    f"   - 节点数: {latest_cluster.node_count}",
+                    f"   - API服务器: {latest_cluster.api_server}",
+                ]
             
         except Exception as e:
-            print(f"⚠️ 获取扫描摘要失败: {e}")
+            lines.append(f"⚠️ 获取扫描摘要失败: {e}")
+        finally:
+            print("\n".join(lines))
     
     async def list_cached_resources(self):
         """列出缓存的资源"""
-        print("📋 缓存的资源列表:")
+        # 先收集所有行再一次性输出，减少stdout写入次数
+        lines = ["📋 缓存的资源列表:"]
         
         try:
             # 列出集群
             clusters = self.cache_manager.list_records('clusters')
             if clusters:
-                print(f"\n🏢 集群 ({len(clusters)} 个):")
-                for cluster in clusters:
-                    print(f"   - {cluster.name} (v{cluster.version})")
+                lines.append(f"\n🏢 集群 ({len(clusters)} 个):")
+                lines.extend(f"   - {cluster.name} (v{cluster.version})" for cluster in clusters)
             
             # 列出命名空间
             namespaces = self.cache_manager.list_records('namespaces')
             if namespaces:
-                print(f"\n📁 命名空间 ({len(namespaces)} 个):")
-                for ns in namespaces[:10]:  # 只显示前10个
-                    print(f"   - {ns.cluster_name}/{ns.name} ({ns.status})")
+                lines.append(f"\n📁 命名空间 ({len(namespaces)} 个):")
+                # 只显示前10个
+                lines.extend(f"   - {ns.cluster_name}/{ns.name} ({ns.status})" for ns in namespaces[:10])
                 if len(namespaces) > 10:
-                    print(f"   ... 还有 {len(namespaces) - 10} 个")
+                    lines.append(f"   ... 还有 {len(namespaces) - 10} 个")
             
             # 列出Pod
             pods = self.cache_manager.list_records('pods')
             if pods:
-                print(f"\n🐳 Pod ({len(pods)} 个):")
-                for pod in pods[:10]:  # 只显示前10个
-                    print(f"   - {pod.cluster_name}/{pod.namespace}/{pod.name} ({pod.phase})")
+                lines.append(f"\n🐳 Pod ({len(pods)} 个):")
+                # 只显示前10个
+                lines.extend(f"   - {pod.cluster_name}/{pod.namespace}/{pod.name} ({pod.phase})" for pod in pods[:10])
                 if len(pods) > 10:
-                    print(f"   ... 还有 {len(pods) - 10} 个")
+                    lines.append(f"   ... 还有 {len(pods) - 10} 个")
             
             # 列出服务
             services = self.cache_manager.list_records('services')
             if services:
-                print(f"\n🌐 服务 ({len(services)} 个):")
-                for service in services[:10]:  # 只显示前10个
-                    print(f"   - {service.cluster_name}/{service.namespace}/{service.name} ({service.type})")
+                lines.append(f"\n🌐 服务 ({len(services)} 个):")
+                # 只显示前10个
+                lines.extend(
+                    f"   - {service.cluster_name}/{service.namespace}/{service.name} ({service.type})"
+                    for service in services[:10]
+                )
                 if len(services) > 10:
-                    print(f"   ... 还有 {len(services) - 10} 个")
+                    lines.append(f"   ... 还有 {len(services) - 10} 个")
             
         except Exception as e:
-            print(f"❌ 列出资源失败: {e}")
+            lines.append(f"❌ 列出资源失败: {e}")
+        finally:
+            print("\n".join(lines))
 
 
 async def main():
     """主函数"""
-    load_dotenv()
+    load_env()
     
     parser = argparse.ArgumentParser(description='K8s集群扫描器')
     parser.add_argument('command', choices=['discover', 'scan', 'full-scan', 'list', 'discover-clusters'],
@@ -247,7 +259,6 @@ async def main():
         sys.exit(1)
     except Exception as e:
         print(f"❌ 程序异常: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
@@ -1,10 +1,17 @@
 import os
-from typing import Dict, Any
+import re
+import sys
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
+from langchain_core.rate_limiters import InMemoryRateLimiter
 from langchain_openai import ChatOpenAI
 
-# 加载环境变量
-load_dotenv()
+# 默认安全停止序列 (可通过 LLM_SAFETY_STOP_SEQUENCES 覆盖)
+DEFAULT_SAFETY_STOP_SEQUENCES = (
+    "```bash", "```sh", "```shell", "rm -rf", "kubectl delete", "docker rmi", "sudo rm"
+)
 
 
 class GeminiMaxConfig:
@@ -13,26 +20,54 @@ class GeminiMaxConfig:
     从环境变量读取所有配置，遵循十二要素应用方法论
     """
 
+    # 必需的环境变量
+    REQUIRED_ENV_VARS = (
+        "OPENROUTER_API_KEY",
+        "OPENROUTER_BASE_URL",
+        "LLM_MODEL_NAME"
+    )
+
+    # 数值型配置: (属性名, 环境变量, 类型, 默认值)
+    NUMERIC_ENV_SCHEMA = (
+        # 模型能力配置
+        ("MAX_INPUT_CONTEXT", "LLM_MAX_INPUT_CONTEXT", int, 1048576),
+        ("MAX_OUTPUT_TOKENS", "LLM_MAX_OUTPUT_TOKENS", int, 32768),
+        ("MAX_TIMEOUT", "LLM_REQUEST_TIMEOUT", int, 600),
+        # 模型行为配置
+        ("TEMPERATURE", "LLM_TEMPERATURE", float, 0.0),
+        ("TOP_P", "LLM_TOP_P", float, 0.05),
+        ("MAX_RETRIES", "LLM_MAX_RETRIES", int, 5),
+        ("MAX_REQUESTS_PER_MINUTE", "LLM_MAX_REQUESTS_PER_MINUTE", int, 0),
+        ("SEED", "LLM_SEED", int, 42),
+    )
+
     def __init__(self):
         """初始化Gemini配置管理器，从环境变量读取所有配置"""
+        # 环境变量只读快照，校验与加载读取同一份数据，避免重复getenv
+        self._env = MappingProxyType(dict(os.environ))
+
         # 验证必要的环境变量
         self._validate_required_env_vars()
 
         # 从环境变量加载配置
         self._load_config_from_env()
 
+        # 已创建的LLM实例缓存，相同参数复用同一实例及其连接池
+        self._llm_cache: Dict[tuple, ChatOpenAI] = {}
+
+        # 进程级令牌桶限流器，所有LLM实例共享，在超出配额前主动等待而非依赖429重试
+        self._rate_limiter: Optional[InMemoryRateLimiter] = None
+        if self.MAX_REQUESTS_PER_MINUTE > 0:
+            self._rate_limiter = InMemoryRateLimiter(
+                requests_per_second=self.MAX_REQUESTS_PER_MINUTE / 60
+            )
+
+        # 所有LLM实例共享的基础参数，只构建一次
+        self._base_llm_params = self._build_base_llm_params()
+
     def _validate_required_env_vars(self):
         """验证必需的环境变量，遵循fail-fast原则"""
-        required_vars = [
-            "OPENROUTER_API_KEY",
-            "OPENROUTER_BASE_URL",
-            "LLM_MODEL_NAME"
-        ]
-
-        missing_vars = []
-        for var in required_vars:
-            if not os.getenv(var):
-                missing_vars.append(var)
+        missing_vars = [var for var in self.REQUIRED_ENV_VARS if not self._env.get(var)]
 
         if missing_vars:
             raise ValueError(
@@ -43,25 +78,34 @@ class GeminiMaxConfig:
     def _load_config_from_env(self):
         """从环境变量加载所有配置"""
         # LLM 提供商配置
-        self.PROVIDER_NAME = os.getenv("LLM_PROVIDER_NAME", "OpenRouter")
-        self.MODEL_NAME = os.getenv("LLM_MODEL_NAME")
-        self.BASE_URL = os.getenv("OPENROUTER_BASE_URL")
-
-        # 模型能力配置
-        self.MAX_INPUT_CONTEXT = int(os.getenv("LLM_MAX_INPUT_CONTEXT", "1048576"))
-        self.MAX_OUTPUT_TOKENS = int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "32768"))
-        self.MAX_TIMEOUT = int(os.getenv("LLM_REQUEST_TIMEOUT", "600"))
-
-        # 模型行为配置
-        self.TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.0"))
-        self.TOP_P = float(os.getenv("LLM_TOP_P", "0.05"))
-        self.MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
-        self.SEED = int(os.getenv("LLM_SEED", "42"))
+        self.PROVIDER_NAME = self._env.get("LLM_PROVIDER_NAME", "OpenRouter")
+        self.API_KEY = self._env.get("OPENROUTER_API_KEY")
+        self.MODEL_NAME = self._env.get("LLM_MODEL_NAME")
+        self.BASE_URL = self._env.get("OPENROUTER_BASE_URL")
+
+        # 模型能力与行为配置，未设置时直接使用类型化默认值
+        for attr, var, cast, default in self.NUMERIC_ENV_SCHEMA:
+            value = self._env.get(var)
+            setattr(self, attr, cast(value) if value else default)
+        # 流式输出可缩短首token延迟，停止序列在流式过程中同样生效
+        self.STREAMING = self._env.get("LLM_STREAMING", "true").lower() == "true"
 
         # 安全配置
-        safety_sequences = os.getenv("LLM_SAFETY_STOP_SEQUENCES",
-                                   "```bash,```sh,```shell,rm -rf,kubectl delete,docker rmi,sudo rm")
-        self.SAFETY_STOP_SEQUENCES = [seq.strip() for seq in safety_sequences.split(",")]
+        safety_sequences = self._env.get("LLM_SAFETY_STOP_SEQUENCES")
+        # 不可变元组，所有LLM实例共享同一份序列；未设置时直接复用默认元组，无需解析
+        if safety_sequences is None:
+            self.SAFETY_STOP_SEQUENCES = DEFAULT_SAFETY_STOP_SEQUENCES
+        else:
+            # 过滤空项避免无效比较
+            self.SAFETY_STOP_SEQUENCES = tuple(
+                sys.intern(seq) for seq in map(str.strip, safety_sequences.split(",")) if seq
+            )
+        # 预编译的多模式匹配，单次扫描检测所有停止序列
+        self.SAFETY_STOP_PATTERN = (
+            re.compile("|".join(map(re.escape, self.SAFETY_STOP_SEQUENCES)))
+            if self.SAFETY_STOP_SEQUENCES else None
+        )
+        self.SAFETY_STOP_MAX_LEN = max(map(len, self.SAFETY_STOP_SEQUENCES), default=0)
 
     def create_llm(self, **kwargs) -> ChatOpenAI:
         """
@@ -74,40 +118,76 @@ class GeminiMaxConfig:
         Returns:
             配置的Gemini 2.5 Flash ChatOpenAI实例
         """
-        # 创建原始LLM
-        llm = ChatOpenAI(
-            model=kwargs.get("model", self.MODEL_NAME),
-            api_key=os.getenv("OPENROUTER_API_KEY"),
-            base_url=kwargs.get("base_url", self.BASE_URL),
+        # 无覆盖参数时直接返回共享的默认实例
+        if not kwargs:
+            return self.default_llm
+
+        cache_key = self._make_cache_key(kwargs)
+        if cache_key is not None and cache_key in self._llm_cache:
+            return self._llm_cache[cache_key]
+
+        # 在共享基础参数上仅应用覆盖项
+        params = dict(self._base_llm_params)
+        params.update((name, value) for name, value in kwargs.items() if name in params)
+        llm = ChatOpenAI(**params)
+        if cache_key is not None:
+            self._llm_cache[cache_key] = llm
+
+        return llm
+
+    @cached_property
+    def default_llm(self) -> ChatOpenAI:
+        """默认配置的LLM实例，只构建一次并复用其HTTP连接池"""
+        return ChatOpenAI(**self._base_llm_params)
+
+    def _build_base_llm_params(self) -> MappingProxyType:
+        """构建ChatOpenAI基础参数 (只读映射)"""
+        return MappingProxyType({
+            "model": self.MODEL_NAME,
+            "api_key": self.API_KEY,
+            "base_url": self.BASE_URL,
 
             # 模型能力配置 (从环境变量)
-            max_tokens=kwargs.get("max_tokens", self.MAX_OUTPUT_TOKENS),
-            temperature=kwargs.get("temperature", self.TEMPERATURE),
-            top_p=kwargs.get("top_p", self.TOP_P),
+            "max_tokens": self.MAX_OUTPUT_TOKENS,
+            "temperature": self.TEMPERATURE,
+            "top_p": self.TOP_P,
 
             # 稳定性配置
-            frequency_penalty=kwargs.get("frequency_penalty", 0.0),
-            presence_penalty=kwargs.get("presence_penalty", 0.0),
-            streaming=kwargs.get("streaming", False),
-            seed=kwargs.get("seed", self.SEED),  # 明确指定seed参数，修复UserWarning
+            "frequency_penalty": 0.0,
+            "presence_penalty": 0.0,
+            "streaming": self.STREAMING,
+            # 流式响应同样返回usage，便于观察提供商前缀缓存命中 (cached_tokens)
+            "stream_usage": True,
+            "seed": self.SEED,  # 明确指定seed参数，修复UserWarning
 
             # 可靠性配置 (从环境变量)
-            max_retries=kwargs.get("max_retries", self.MAX_RETRIES),
-            request_timeout=kwargs.get("request_timeout", self.MAX_TIMEOUT),
+            "max_retries": self.MAX_RETRIES,
+            "request_timeout": self.MAX_TIMEOUT,
+            "rate_limiter": self._rate_limiter,
 
             # 安全配置 (从环境变量)
-            stop=kwargs.get("stop", self.SAFETY_STOP_SEQUENCES),
-        )
-        
-        # 包装为追踪版本
-        return llm
+            "stop": self.SAFETY_STOP_SEQUENCES,
+        })
+
+    @staticmethod
+    def _make_cache_key(kwargs: Dict[str, Any]) -> Optional[tuple]:
+        """将覆盖参数转换为可哈希的缓存键，无法哈希时返回None"""
+        key = tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in kwargs.items()
+        ))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
     
-    def get_model_info(self) -> Dict[str, Any]:
-        """获取模型信息 (从环境变量配置)"""
-        api_key = os.getenv("OPENROUTER_API_KEY", "")
-        masked_key = api_key[:10] + "..." if api_key else "未设置"
+    @cached_property
+    def model_info(self) -> MappingProxyType:
+        """模型信息 (从环境变量配置)，配置加载后不再变化，只构建一次 (只读映射)"""
+        masked_key = self.API_KEY[:10] + "..." if self.API_KEY else "未设置"
 
-        return {
+        return MappingProxyType({
             "provider": self.PROVIDER_NAME,
             "model": self.MODEL_NAME,
             "api_key": masked_key,
@@ -118,27 +198,56 @@ class GeminiMaxConfig:
             "temperature": self.TEMPERATURE,
             "top_p": self.TOP_P,
             "max_retries": self.MAX_RETRIES,
-            "features": ["工具调用", "大上下文", "推理模式", "K8s运维"],
+            "features": ("工具调用", "大上下文", "推理模式", "K8s运维"),
             "configuration": "环境变量配置 - 遵循十二要素应用方法论"
-        }
+        })
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """获取模型信息 (从环境变量配置)，每次返回独立副本，调用方修改不影响缓存"""
+        info = dict(self.model_info)
+        info["features"] = list(info["features"])
+        return info
+
+
+@lru_cache(maxsize=1)
+def load_env() -> bool:
+    """加载 .env 文件，进程内只读取解析一次"""
+    return load_dotenv()
 
 
-# 全局配置实例 - 从环境变量初始化
-gemini_config = GeminiMaxConfig()
+@lru_cache(maxsize=1)
+def get_config() -> GeminiMaxConfig:
+    """获取全局配置实例，首次使用时才加载 .env 并校验环境变量"""
+    load_env()
+    return GeminiMaxConfig()
+
+
+def __getattr__(name: str) -> Any:
+    # 兼容 `from src.llm_config import gemini_config`，按需创建全局配置实例
+    if name == "gemini_config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def create_llm(**kwargs) -> ChatOpenAI:
-    return gemini_config.create_llm(**kwargs)
+    return get_config().create_llm(**kwargs)
+
+
+def get_model_info() -> Dict[str, Any]:
+    return get_config().get_model_info()
 
 
 def print_model_status():
     """打印当前模型状态"""
-    info = gemini_config.get_model_info()
-    print(f"🤖 当前LLM模型: {info['model']}")
-    print(f"🔗 服务地址: {info['base_url']}")
-    print(f"🔑 API密钥: {info['api_key']}")
-    print(f"📏 输入上下文: {info['input_context']}")
-    print(f"📤 输出能力: {info['output_tokens']}")
-    print(f"⏱️  超时设置: {info['timeout']}")
-    print(f"🛠️  功能特性: {', '.join(info['features'])}")
-    print(f"⚙️  配置模式: {info['configuration']}")
\ No newline at end of file
+    info = get_model_info()
+    # 拼接后一次写出，避免逐行获取stdout锁
+    print("\n".join((
+        f"🤖 当前LLM模型: {info['model']}",
+        f"🔗 服务地址: {info['base_url']}",
+        f"🔑 API密钥: {info['api_key']}",
+        f"📏 输入上下文: {info['input_context']}",
+        f"📤 输出能力: {info['output_tokens']}",
+        f"⏱️  超时设置: {info['timeout']}",
+        f"🛠️  功能特性: {', '.join(info['features'])}",
+        f"⚙️  配置模式: {info['configuration']}",
+    )))
\ No newline at end of file
@@ -1,15 +1,64 @@
 import asyncio
 import os
-from dotenv import load_dotenv
 from mcp_use import MCPAgent, MCPClient
 
-from src.llm_config import create_llm, print_model_status
+from src.llm_config import create_llm, get_config, print_model_status
+
+# 数据真实性规则 - 作为不变的系统提示前缀，每轮请求保持一致以便命中提供商前缀缓存
+DATA_INTEGRITY_RULES = """严格要求：
+1. 绝对不要编造、修改、删减或压缩任何返回数据
+2. 严格遵循工具返回的原始结果，保持数据完整性
+3. 只允许对数据进行结构化输出和美化展示
+4. 保留所有字段、值和数据结构，不得省略任何信息
+5. 如果工具调用失败，必须明确报告失败原因，不得提供任何模拟数据
+
+你的职责仅限于：数据格式化和可读性优化，严禁任何形式的数据创造或修改。"""
+
+
+async def stream_instruction(agent: MCPAgent, instruction: str, max_steps: int = 30) -> int:
+    """流式执行单条指令，边生成边输出，检测到危险序列时中止，返回已输出的字符数"""
+    config = get_config()
+    pattern = config.SAFETY_STOP_PATTERN
+    overlap = config.SAFETY_STOP_MAX_LEN - 1
+    # 尚未输出的尾部文本，可能是跨片段危险序列的前缀
+    carry = ""
+    printed = 0
+    events = agent.stream_events(instruction, max_steps=max_steps)
+    try:
+        async for event in events:
+            if event.get("event") != "on_chat_model_stream":
+                continue
+            content = event["data"]["chunk"].content
+            if not isinstance(content, str) or not content:
+                continue
+
+            # 先扫描再输出，危险序列本身不会被打印
+            # 只扫描新片段及未输出的尾部，而非整个缓冲区
+            pending = carry + content
+            match = pattern.search(pending) if pattern else None
+            if match:
+                # 检测到危险序列立即中止生成，节省剩余输出token
+                print(pending[:match.start()], end="")
+                printed += match.start()
+                print("\n⚠️  检测到危险输出序列，已中止生成")
+                carry = ""
+                break
+            # 保留最后 SAFETY_STOP_MAX_LEN-1 个字符，等下一片段到达后再判断
+            split = max(len(pending) - overlap, 0)
+            print(pending[:split], end="", flush=True)
+            printed += split
+            carry = pending[split:]
+    finally:
+        await events.aclose()
+    # 流结束后尾部已无法再组成危险序列，补齐输出
+    print(carry)
+    return printed + len(carry)
 
 
 async def main():
     """运行K8s MCP Agent，所有配置从环境变量读取"""
-    # Load environment variables
-    load_dotenv()
+    # 加载 .env 并校验LLM配置，全局配置只在首次调用时加载一次
+    get_config()
 
     print_model_status()
 
@@ -49,28 +98,34 @@ async def main():
     print("✅ MCP服务器连接成功")
     
     # Create agent with the client
-    agent = MCPAgent(llm=llm, client=client, max_steps=30)
+    agent = MCPAgent(
+        llm=llm,
+        client=client,
+        max_steps=30,
+        additional_instructions=DATA_INTEGRITY_RULES
+    )
     print("✅ K8s MCP Agent 创建成功")
 
-    instruction = """使用 LIST_CLUSTERS 工具获取真实的 Kubernetes 集群列表。
-
-严格要求：
-1. 绝对不要编造、修改、删减或压缩任何返回数据
-2. 严格遵循工具返回的原始结果，保持数据完整性
-3. 只允许对数据进行结构化输出和美化展示
-4. 保留所有字段、值和数据结构，不得省略任何信息
-5. 如果工具调用失败，必须明确报告失败原因，不得提供任何模拟数据
-
-你的职责仅限于：数据格式化和可读性优化，严禁任何形式的数据创造或修改。"""
+    instruction = "使用 LIST_CLUSTERS 工具获取真实的 Kubernetes 集群列表。"
     print(f"📤 发送指令到Agent (长度: {len(instruction)} chars)")
-    result = await agent.run(
-        instruction,
-        max_steps=30,  # 减少步数，避免复杂操作
-    )
-
-    print(f"📥 Agent返回结果 (长度: {len(str(result))} chars)")
-    print(f"📋 查询结果: {result}")
 
+    # 开启流式输出时边生成边打印，避免等待完整响应
+    if get_config().STREAMING:
+        print("📋 查询结果: ", end="")
+        result_len = await stream_instruction(agent, instruction, max_steps=30)
+    else:
+        result = await agent.run(
+            instruction,
+            max_steps=30,  # 减少步数，避免复杂操作
+        )
+
+        # 结果只转换一次字符串，长度统计和输出复用同一份
+        result_str = result if isinstance(result, str) else str(result)
+        print(f"📋 查询结果: {result_str}")
+        result_len = len(result_str)
+
+    # 两种输出方式使用同一份结果摘要
+    print(f"📥 Agent返回结果 (长度: {result_len} chars)")
 
 if __name__ == "__main__":
     # Run the appropriate example
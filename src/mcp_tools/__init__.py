@@ -4,18 +4,39 @@ MCP工具预加载系统
 遵循Python编码规范和fail-fast原则
 """
 
-from .tool_loader import MCPToolLoader
-from .schema_parser import SchemaParser
-from .capability_analyzer import CapabilityAnalyzer
-from .tool_selector import ToolSelector
-from .models import ToolSchema, ToolCapabilities, ToolSelectionCriteria, ToolRanking
-from .exceptions import (
-    MCPConnectionError,
-    ToolLoadError,
-    SchemaParseError,
-    ToolValidationError,
-    CapabilityAnalysisError
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .tool_loader import MCPToolLoader
+    from .schema_parser import SchemaParser
+    from .capability_analyzer import CapabilityAnalyzer
+    from .tool_selector import ToolSelector
+    from .models import ToolSchema, ToolCapabilities, ToolSelectionCriteria, ToolRanking
+    from .exceptions import (
+        MCPConnectionError,
+        ToolLoadError,
+        SchemaParseError,
+        ToolValidationError,
+        CapabilityAnalysisError
+    )
+
+# 导出名称 -> 所在子模块，首次访问时才导入 (PEP 562)
+_LAZY_IMPORTS = {
+    'MCPToolLoader': 'tool_loader',
+    'SchemaParser': 'schema_parser',
+    'CapabilityAnalyzer': 'capability_analyzer',
+    'ToolSelector': 'tool_selector',
+    'ToolSchema': 'models',
+    'ToolCapabilities': 'models',
+    'ToolSelectionCriteria': 'models',
+    'ToolRanking': 'models',
+    'MCPConnectionError': 'exceptions',
+    'ToolLoadError': 'exceptions',
+    'SchemaParseError': 'exceptions',
+    'ToolValidationError': 'exceptions',
+    'CapabilityAnalysisError': 'exceptions'
+}
 
 __all__ = [
     'MCPToolLoader',
@@ -32,3 +53,18 @@ __all__ = [
     'ToolValidationError',
     'CapabilityAnalysisError'
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # 缓存到模块命名空间，后续访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
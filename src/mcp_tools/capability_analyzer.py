@@ -4,14 +4,28 @@ MCP工具能力分析器
 遵循单一职责原则，文件大小控制在150行以内
 """
 
+import json
 import re
-import time
-from typing import Dict, Any, List, Set
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Any, List, Optional, Pattern, Set
 
 from .models import ToolCapabilities, ToolSchema, K8S_RESOURCE_TYPES, K8S_OPERATION_TYPES
 from .exceptions import CapabilityAnalysisError
 
 
+def _compile_category_regex(patterns: Dict[str, List[str]]) -> Pattern[str]:
+    """将 {类别: [关键词]} 编译为单个正则，每个类别对应一个命名分组
+
+    匹配放在零宽前瞻中，保留子串语义：关键词可相互重叠 (如cronjob同时命中job)
+    """
+    alternatives = "|".join(
+        f"(?P<{category}>{'|'.join(map(re.escape, keywords))})"
+        for category, keywords in patterns.items()
+    )
+    return re.compile(f"(?=(?:{alternatives}))", re.IGNORECASE)
+
+
 class CapabilityAnalyzer:
     """工具能力分析器 - 专注K8s能力分析和推断"""
     
@@ -44,10 +58,25 @@ class CapabilityAnalyzer:
         'top': ['top', 'metrics', 'usage', 'stats']
     }
     
+    # 预编译的多模式正则，单次扫描即可得到所有命中的类别
+    RESOURCE_REGEX = _compile_category_regex(RESOURCE_PATTERNS)
+    OPERATION_REGEX = _compile_category_regex(OPERATION_PATTERNS)
+    
+    # 作用域推断规则，按优先级排列: (作用域, 工具名称关键词正则)
+    SCOPE_NAME_REGEXES = (
+        ('cluster', re.compile('cluster|master|control')),
+        ('namespace', re.compile('namespace|ns|project')),
+        ('node', re.compile('node|worker|machine')),
+        ('pod', re.compile('pod|container'))
+    )
+    
     def __init__(self) -> None:
         """初始化能力分析器"""
         self.analyzed_count = 0
         self.error_count = 0
+        self.cache_hits = 0
+        # 分析结果缓存，相同schema内容的工具在重新加载时不再重复分析
+        self._analysis_cache: Dict[tuple, Dict[str, Any]] = {}
     
     def analyze_tool_capabilities(
         self,
@@ -64,14 +93,60 @@ class CapabilityAnalyzer:
         Raises:
             CapabilityAnalysisError: 能力分析失败时抛出
         """
-        start_time = time.time()
+        return self._analyze(tool_schema)
+
+    def analyze_many(self, tool_schemas: List[ToolSchema]) -> List[ToolCapabilities]:
+        """批量分析工具能力
+
+        所有工具的名称和描述以\\x00拼接后只做一次资源类型正则扫描，
+        再按偏移量将命中结果分配回各工具，其余分析逐个工具进行
+
+        Args:
+            tool_schemas: 工具schema对象列表
+
+        Returns:
+            与输入顺序一致的工具能力分析结果列表
+
+        Raises:
+            CapabilityAnalysisError: 任一工具能力分析失败时抛出
+        """
+        texts = [f"{schema.name} {schema.description}" for schema in tool_schemas]
+        # offsets[i] 为第i+1个工具文本在拼接语料中的起始位置
+        offsets = list(accumulate(len(text) + 1 for text in texts))
+        matched: List[Set[str]] = [set() for _ in texts]
 
+        for match in self.RESOURCE_REGEX.finditer("\x00".join(texts)):
+            matched[bisect_right(offsets, match.start())].add(match.lastgroup)
+
+        return [
+            self._analyze(schema, list(resource_types or self._match_k8s_resource_types(text)))
+            for schema, text, resource_types in zip(tool_schemas, texts, matched)
+        ]
+
+    def _analyze(
+        self,
+        tool_schema: ToolSchema,
+        resource_types: Optional[List[str]] = None
+    ) -> ToolCapabilities:
+        """分析单个工具能力，resource_types为批量扫描预先推断的资源类型"""
         try:
-            # 执行核心分析
-            analysis_result = self._perform_core_analysis(tool_schema)
+            cache_key = self._make_cache_key(tool_schema)
+            analysis_result = self._analysis_cache.get(cache_key) if cache_key is not None else None
 
-            # 创建能力对象
-            capabilities = ToolCapabilities(**analysis_result)
+            if analysis_result is None:
+                # 执行核心分析
+                analysis_result = self._perform_core_analysis(tool_schema, resource_types)
+                if cache_key is not None:
+                    self._analysis_cache[cache_key] = analysis_result
+            else:
+                self.cache_hits += 1
+
+            # 创建能力对象，列表字段复制一份，避免不同实例共享缓存中的列表
+            capabilities = ToolCapabilities(**{
+                **analysis_result,
+                'resource_types': list(analysis_result['resource_types']),
+                'operation_types': list(analysis_result['operation_types'])
+            })
 
             self.analyzed_count += 1
             return capabilities
@@ -80,14 +155,35 @@ class CapabilityAnalyzer:
             self.error_count += 1
             raise CapabilityAnalysisError(f"工具能力分析失败: {e}") from e
 
-    def _perform_core_analysis(self, tool_schema: ToolSchema) -> Dict[str, Any]:
-        """执行核心分析逻辑"""
-        # 推断资源类型
-        resource_types = self.infer_resource_types(
+    @staticmethod
+    def _make_cache_key(tool_schema: ToolSchema) -> Optional[tuple]:
+        """根据schema内容生成缓存键，input_schema无法序列化时返回None"""
+        try:
+            schema_key = json.dumps(tool_schema.input_schema, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+
+        return (
             tool_schema.name,
-            tool_schema.description
+            tool_schema.description,
+            schema_key,
+            tuple(tool_schema.required_params or ()),
+            tuple(tool_schema.optional_params or ())
         )
 
+    def _perform_core_analysis(
+        self,
+        tool_schema: ToolSchema,
+        resource_types: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """执行核心分析逻辑"""
+        # 推断资源类型 (批量分析时已预先推断)
+        if resource_types is None:
+            resource_types = self.infer_resource_types(
+                tool_schema.name,
+                tool_schema.description
+            )
+
         # 推断操作类型
         operation_types = self.infer_operation_types(
             tool_schema.name,
@@ -95,7 +191,7 @@ class CapabilityAnalyzer:
         )
 
         # 推断作用域
-        scope = self._infer_scope(tool_schema.name, resource_types)
+        scope = self._infer_scope(tool_schema.name_lower, resource_types)
 
         # 评估缓存友好性
         cache_friendly = self._evaluate_cache_friendliness(operation_types)
@@ -105,7 +201,7 @@ class CapabilityAnalyzer:
 
         # 计算置信度
         confidence_score = self._calculate_confidence_score(
-            tool_schema.name,
+            tool_schema.name_lower,
             tool_schema.description,
             resource_types,
             operation_types
@@ -123,45 +219,39 @@ class CapabilityAnalyzer:
     
     def infer_resource_types(self, tool_name: str, description: str) -> List[str]:
         """推断支持的资源类型"""
-        resource_types: Set[str] = set()
-        text = f"{tool_name} {description}".lower()
-        
-        for resource, patterns in self.RESOURCE_PATTERNS.items():
-            for pattern in patterns:
-                if pattern in text:
-                    resource_types.add(resource)
+        text = f"{tool_name} {description}"
+        resource_types: Set[str] = {
+            match.lastgroup for match in self.RESOURCE_REGEX.finditer(text)
+        }
         
         # 如果没有匹配到具体资源，尝试通用匹配
         if not resource_types:
-            for k8s_resource in K8S_RESOURCE_TYPES:
-                if k8s_resource in text:
-                    resource_types.add(k8s_resource)
+            resource_types = self._match_k8s_resource_types(text)
         
         return list(resource_types)
     
+    def _match_k8s_resource_types(self, text: str) -> Set[str]:
+        """通用匹配: 查找文本中出现的K8s资源类型名称"""
+        text = text.lower()
+        return {k8s_resource for k8s_resource in K8S_RESOURCE_TYPES if k8s_resource in text}
+    
     def infer_operation_types(
         self, 
         tool_name: str, 
         input_schema: Dict[str, Any]
     ) -> List[str]:
         """推断操作类型"""
-        operation_types: Set[str] = set()
-        text = tool_name.lower()
-        
         # 从工具名称推断
-        for operation, patterns in self.OPERATION_PATTERNS.items():
-            for pattern in patterns:
-                if pattern in text:
-                    operation_types.add(operation)
+        operation_types: Set[str] = {
+            match.lastgroup for match in self.OPERATION_REGEX.finditer(tool_name)
+        }
         
         # 从参数名称推断
         properties = input_schema.get('properties', {})
         for param_name in properties.keys():
-            param_lower = param_name.lower()
-            for operation, patterns in self.OPERATION_PATTERNS.items():
-                for pattern in patterns:
-                    if pattern in param_lower:
-                        operation_types.add(operation)
+            operation_types.update(
+                match.lastgroup for match in self.OPERATION_REGEX.finditer(param_name)
+            )
         
         # 如果没有匹配到，默认为查询操作
         if not operation_types:
@@ -169,32 +259,17 @@ class CapabilityAnalyzer:
         
         return list(operation_types)
     
-    def _infer_scope(self, tool_name: str, resource_types: List[str]) -> str:
-        """推断工具作用域"""
-        name_lower = tool_name.lower()
-        
+    def _infer_scope(self, name_lower: str, resource_types: List[str]) -> str:
+        """推断工具作用域 (name_lower为小写工具名称)"""
         # 从工具名称推断
-        if any(keyword in name_lower for keyword in ['cluster', 'master', 'control']):
-            return 'cluster'
-        
-        if any(keyword in name_lower for keyword in ['namespace', 'ns', 'project']):
-            return 'namespace'
-        
-        if any(keyword in name_lower for keyword in ['node', 'worker', 'machine']):
-            return 'node'
-        
-        if any(keyword in name_lower for keyword in ['pod', 'container']):
-            return 'pod'
+        for scope, name_regex in self.SCOPE_NAME_REGEXES:
+            if name_regex.search(name_lower):
+                return scope
         
         # 从资源类型推断
-        if 'cluster' in resource_types:
-            return 'cluster'
-        elif 'namespace' in resource_types:
-            return 'namespace'
-        elif 'node' in resource_types:
-            return 'node'
-        elif 'pod' in resource_types:
-            return 'pod'
+        for scope, _ in self.SCOPE_NAME_REGEXES:
+            if scope in resource_types:
+                return scope
         
         # 默认为资源级别
         return 'resource'
@@ -235,12 +310,12 @@ class CapabilityAnalyzer:
     
     def _calculate_confidence_score(
         self,
-        tool_name: str,
+        name_lower: str,
         description: str,
         resource_types: List[str],
         operation_types: List[str]
     ) -> float:
-        """计算分析置信度 (0.0-1.0)"""
+        """计算分析置信度 (0.0-1.0)，name_lower为小写工具名称"""
         confidence = 0.5  # 基础置信度
         
         # 如果有明确的资源类型匹配，增加置信度
@@ -253,7 +328,7 @@ class CapabilityAnalyzer:
         
         # 如果工具名称包含K8s相关关键词，增加置信度
         k8s_keywords = ['k8s', 'kubectl', 'kubernetes', 'kube']
-        if any(keyword in tool_name.lower() for keyword in k8s_keywords):
+        if any(keyword in name_lower for keyword in k8s_keywords):
             confidence += 0.1
         
         return min(confidence, 1.0)
@@ -278,6 +353,7 @@ class CapabilityAnalyzer:
         return {
             'analyzed_count': self.analyzed_count,
             'error_count': self.error_count,
+            'cache_hits': self.cache_hits,
             'success_rate': (
                 self.analyzed_count / max(1, self.analyzed_count + self.error_count)
             ) * 100
@@ -3,12 +3,12 @@ MCP工具预加载系统数据模型
 定义工具schema、能力和选择相关的数据结构
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolSchema:
     """工具Schema数据模型"""
     name: str
@@ -17,27 +17,31 @@ class ToolSchema:
     output_schema: Optional[Dict[str, Any]] = None
     required_params: Optional[List[str]] = None
     optional_params: Optional[List[str]] = None
+    # 小写工具名称，构造时计算一次供能力分析复用
+    name_lower: str = field(init=False, repr=False, compare=False)
     
     def __post_init__(self) -> None:
         """初始化后处理，提取参数信息"""
+        # frozen数据类，初始化阶段的派生字段通过object.__setattr__写入
+        object.__setattr__(self, 'name_lower', self.name.lower())
         if self.required_params is None or self.optional_params is None:
             self._extract_parameters()
     
     def _extract_parameters(self) -> None:
         """从input_schema中提取参数信息"""
         if not isinstance(self.input_schema, dict):
-            self.required_params = []
-            self.optional_params = []
+            object.__setattr__(self, 'required_params', [])
+            object.__setattr__(self, 'optional_params', [])
             return
         
         properties = self.input_schema.get('properties', {})
         required = self.input_schema.get('required', [])
         
-        self.required_params = [param for param in required if param in properties]
-        self.optional_params = [
+        object.__setattr__(self, 'required_params', [param for param in required if param in properties])
+        object.__setattr__(self, 'optional_params', [
             param for param in properties.keys() 
             if param not in required
-        ]
+        ])
     
     def get_parameter_info(self, param_name: str) -> Optional[Dict[str, Any]]:
         """获取参数详细信息
@@ -56,7 +60,7 @@ class ToolSchema:
         return param_name in (self.required_params or [])
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolCapabilities:
     """工具能力数据模型"""
     tool_name: str
@@ -66,6 +70,9 @@ class ToolCapabilities:
     cache_friendly: bool  # 是否适合缓存
     complexity_score: int  # 复杂度评分 (1-10)
     confidence_score: float = 1.0  # 分析置信度 (0.0-1.0)
+    # 小写的资源/操作类型集合，构造时计算一次，匹配时O(1)查找
+    _resource_set: frozenset = field(init=False, repr=False, compare=False)
+    _operation_set: frozenset = field(init=False, repr=False, compare=False)
     
     def __post_init__(self) -> None:
         """验证数据有效性"""
@@ -78,14 +85,17 @@ class ToolCapabilities:
         valid_scopes = {'cluster', 'namespace', 'node', 'pod', 'resource'}
         if self.scope not in valid_scopes:
             raise ValueError(f"无效的作用域: {self.scope}，有效值: {valid_scopes}")
+        
+        object.__setattr__(self, '_resource_set', frozenset(rt.lower() for rt in self.resource_types))
+        object.__setattr__(self, '_operation_set', frozenset(ot.lower() for ot in self.operation_types))
     
     def supports_resource(self, resource_type: str) -> bool:
         """检查是否支持指定的资源类型"""
-        return resource_type.lower() in [rt.lower() for rt in self.resource_types]
+        return resource_type.lower() in self._resource_set
     
     def supports_operation(self, operation_type: str) -> bool:
         """检查是否支持指定的操作类型"""
-        return operation_type.lower() in [ot.lower() for ot in self.operation_types]
+        return operation_type.lower() in self._operation_set
     
     def is_compatible_with(
         self, 
@@ -102,7 +112,7 @@ class ToolCapabilities:
         return True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolSelectionCriteria:
     """工具选择条件"""
     resource_type: Optional[str] = None
@@ -135,7 +145,7 @@ class ToolSelectionCriteria:
         return True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolRanking:
     """工具排序结果"""
     tool_name: str
@@ -5,12 +5,14 @@ MCP工具Schema解析器
 """
 
 import json
-import time
 from typing import Dict, Any, List, Tuple, Optional
 
 from .models import ToolSchema
 from .exceptions import SchemaParseError
 
+# 工具数据必需字段
+REQUIRED_TOOL_FIELDS = frozenset({'name'})
+
 
 class SchemaParser:
     """MCP工具Schema解析器 - 专注schema解析和验证"""
@@ -32,8 +34,6 @@ class SchemaParser:
         Raises:
             SchemaParseError: schema解析失败时抛出
         """
-        start_time = time.time()
-        
         try:
             # 验证必需字段
             self._validate_required_fields(tool_data)
@@ -99,38 +99,25 @@ class SchemaParser:
         Returns:
             是否有效
         """
-        try:
-            # 检查基本结构
-            if not isinstance(schema, dict):
-                return False
-            
-            # 检查type字段
-            if 'type' not in schema:
-                return False
-            
-            # 如果是object类型，检查properties
-            if schema.get('type') == 'object':
-                properties = schema.get('properties')
-                if properties is not None and not isinstance(properties, dict):
-                    return False
-            
-            # 检查required字段
-            required = schema.get('required')
-            if required is not None and not isinstance(required, list):
-                return False
-            
-            return True
-            
-        except Exception:
+        # 检查基本结构和type字段 (纯布尔判断，无需异常处理)
+        if not isinstance(schema, dict) or 'type' not in schema:
             return False
+        
+        # 如果是object类型，检查properties
+        if schema['type'] == 'object':
+            properties = schema.get('properties')
+            if properties is not None and not isinstance(properties, dict):
+                return False
+        
+        # 检查required字段
+        required = schema.get('required')
+        return required is None or isinstance(required, list)
     
     def _validate_required_fields(self, tool_data: Dict[str, Any]) -> None:
         """验证工具数据的必需字段"""
-        required_fields = ['name']
-        
-        for field in required_fields:
-            if field not in tool_data:
-                raise ValueError(f"缺少必需字段: {field}")
+        missing_fields = REQUIRED_TOOL_FIELDS - tool_data.keys()
+        if missing_fields:
+            raise ValueError(f"缺少必需字段: {', '.join(sorted(missing_fields))}")
         
         if not isinstance(tool_data['name'], str) or not tool_data['name'].strip():
             raise ValueError("工具名称必须是非空字符串")
@@ -9,14 +9,13 @@ import sys
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from pathlib import Path
-from dotenv import load_dotenv
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / 'src'))
 
-from src.llm_config import create_llm
+from src.llm_config import create_llm, load_env
 from src.cache.cache_manager import CacheManager
 from src.cache.models import ClusterInfo, NamespaceInfo, NodeInfo, PodInfo, ServiceInfo, CacheMetadata
 from src.scanner.exceptions import ScanError, ToolNotFoundError
@@ -30,6 +29,9 @@ class ClusterScanApp:
         self.cache_manager = CacheManager()
         self.agent: Optional[MCPAgent] = None
         self.available_tools: Dict[str, Any] = {}
+        self._mcp_env: Dict[str, Optional[str]] = {}
+        # 仅在完整初始化流程成功后置位
+        self._initialized = False
         self.scan_stats = {
             'total_scans': 0,
             'successful_scans': 0,
@@ -40,6 +42,10 @@ class ClusterScanApp:
     
     async def initialize(self) -> None:
         """初始化扫描应用"""
+        # 已初始化时复用现有MCP客户端与Agent，避免重复连接和工具发现
+        if self._initialized:
+            return
+
         try:
             print("🔧 初始化K8s集群扫描应用...")
             
@@ -52,6 +58,7 @@ class ClusterScanApp:
             # 加载可用工具
             await self._load_available_tools()
             
+            self._initialized = True
             print("✅ 扫描应用初始化完成")
             
         except Exception as e:
@@ -60,7 +67,9 @@ class ClusterScanApp:
     def _validate_environment(self) -> None:
         """验证环境配置"""
         required_vars = ["MCP_SERVER_URL", "MCP_SERVER_TYPE", "MCP_SERVER_NAME"]
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        # 每个变量只读取一次，创建Agent时复用校验过的值
+        self._mcp_env = {var: os.environ.get(var) for var in required_vars}
+        missing_vars = [var for var, value in self._mcp_env.items() if not value]
         
         if missing_vars:
             raise ScanError(f"缺少必需的环境变量: {', '.join(missing_vars)}")
@@ -70,18 +79,20 @@ class ClusterScanApp:
         try:
             config = {
                 "mcpServers": {
-                    os.getenv("MCP_SERVER_NAME"): {
-                        "type": os.getenv("MCP_SERVER_TYPE"),
-                        "url": os.getenv("MCP_SERVER_URL")
+                    self._mcp_env["MCP_SERVER_NAME"]: {
+                        "type": self._mcp_env["MCP_SERVER_TYPE"],
+                        "url": self._mcp_env["MCP_SERVER_URL"]
                     }
                 }
             }
             
             mcp_client = MCPClient.from_dict(config)
+            # 扫描指令均自包含，不保留对话历史，避免上下文随调用次数无限增长
             self.agent = MCPAgent(
                 llm=create_llm(),
                 client=mcp_client,
-                max_steps=30
+                max_steps=30,
+                memory_enabled=False
             )
             
         except Exception as e:
@@ -430,7 +441,7 @@ class ClusterScanApp:
 
 async def main():
     """主函数"""
-    load_dotenv()
+    load_env()
     
     print("=" * 60)
     print("🔍 K8s集群扫描应用程序")
@@ -56,14 +56,35 @@ class ClusterScanner:
         self.max_retries = max_retries
 
         # 创建LLM和Agent（关键修复！）
+        # 每条扫描指令自包含，不保留对话历史，避免上下文随调用次数无限增长
         self.llm = create_llm()
-        self.agent = MCPAgent(llm=self.llm, client=mcp_client, max_steps=30)
+        self.agent = MCPAgent(
+            llm=self.llm,
+            client=mcp_client,
+            max_steps=30,
+            memory_enabled=False
+        )
+
+        # 并发扫描共享同一Agent，须在并发前完成一次初始化
+        self._agent_init_lock = asyncio.Lock()
+        self._agent_initialized = False
 
         # 统计信息
         self.scan_count = 0
         self.error_count = 0
         self.total_scan_time = 0.0
     
+    async def _ensure_agent_initialized(self) -> None:
+        """并发调用agent.run()前初始化一次Agent
+
+        mcp_use的run()在未初始化时无锁地惰性初始化，并在失败时关闭所有会话；
+        预先初始化可避免并发任务竞争创建会话或互相关闭会话
+        """
+        async with self._agent_init_lock:
+            if not self._agent_initialized:
+                await self.agent.initialize()
+                self._agent_initialized = True
+    
     async def scan_static_resources(
         self,
         cluster_name: Optional[str] = None
@@ -82,16 +103,20 @@ class ClusterScanner:
         start_time = time.time()
         
         try:
-            results = {}
-            
-            # 扫描集群信息
-            results['cluster'] = await self._scan_cluster_info(cluster_name)
-            
-            # 扫描命名空间
-            results['namespaces'] = await self._scan_namespaces(cluster_name)
-            
-            # 扫描节点
-            results['nodes'] = await self._scan_nodes(cluster_name)
+            await self._ensure_agent_initialized()
+
+            # 集群信息、命名空间、节点相互独立，并发扫描
+            # 使用TaskGroup，任一扫描失败时取消其余仍在运行的扫描
+            async with asyncio.TaskGroup() as tg:
+                cluster = tg.create_task(self._scan_cluster_info(cluster_name))
+                namespaces = tg.create_task(self._scan_namespaces(cluster_name))
+                nodes = tg.create_task(self._scan_nodes(cluster_name))
+
+            results = {
+                'cluster': cluster.result(),
+                'namespaces': namespaces.result(),
+                'nodes': nodes.result()
+            }
             
             self.scan_count += 1
             self.total_scan_time += time.time() - start_time
@@ -100,7 +125,9 @@ class ClusterScanner:
             
         except Exception as e:
             self.error_count += 1
-            raise ScanError(f"静态资源扫描失败: {e}") from e
+            # TaskGroup将子任务异常包装为ExceptionGroup，报告首个失败原因
+            cause = e.exceptions[0] if isinstance(e, ExceptionGroup) else e
+            raise ScanError(f"静态资源扫描失败: {cause}") from e
     
     async def scan_dynamic_resources(
         self,
@@ -122,22 +149,24 @@ class ClusterScanner:
         start_time = time.time()
         
         try:
-            results = {}
-            
-            # 扫描Pod
-            results['pods'] = await self._scan_pods(cluster_name, namespace)
-            
-            # 扫描服务
-            results['services'] = await self._scan_services(cluster_name, namespace)
-            
-            # 扫描部署
-            results['deployments'] = await self._scan_deployments(cluster_name, namespace)
+            await self._ensure_agent_initialized()
 
-            # 扫描ConfigMap
-            results['configmaps'] = await self._scan_configmaps(cluster_name, namespace)
+            # 各类动态资源相互独立，并发扫描
+            # 使用TaskGroup，任一扫描失败时取消其余仍在运行的扫描
+            async with asyncio.TaskGroup() as tg:
+                pods = tg.create_task(self._scan_pods(cluster_name, namespace))
+                services = tg.create_task(self._scan_services(cluster_name, namespace))
+                deployments = tg.create_task(self._scan_deployments(cluster_name, namespace))
+                configmaps = tg.create_task(self._scan_configmaps(cluster_name, namespace))
+                secrets = tg.create_task(self._scan_secrets(cluster_name, namespace))
 
-            # 扫描Secret
-            results['secrets'] = await self._scan_secrets(cluster_name, namespace)
+            results = {
+                'pods': pods.result(),
+                'services': services.result(),
+                'deployments': deployments.result(),
+                'configmaps': configmaps.result(),
+                'secrets': secrets.result()
+            }
 
             self.scan_count += 1
             self.total_scan_time += time.time() - start_time
@@ -146,7 +175,9 @@ class ClusterScanner:
             
         except Exception as e:
             self.error_count += 1
-            raise ScanError(f"动态资源扫描失败: {e}") from e
+            # TaskGroup将子任务异常包装为ExceptionGroup，报告首个失败原因
+            cause = e.exceptions[0] if isinstance(e, ExceptionGroup) else e
+            raise ScanError(f"动态资源扫描失败: {cause}") from e
     
     async def _scan_cluster_info(self, cluster_name: Optional[str]) -> Dict[str, Any]:
         """扫描集群信息"""
@@ -13,6 +13,10 @@ from src.cache.models import (
     ClusterInfo, NamespaceInfo, NodeInfo, PodInfo, ServiceInfo
 )
 
+# 校验用的枚举值集合，模块级常量避免每次校验重建列表
+VALID_POD_PHASES = frozenset({'Pending', 'Running', 'Succeeded', 'Failed', 'Unknown'})
+VALID_SERVICE_TYPES = frozenset({'ClusterIP', 'NodePort', 'LoadBalancer', 'ExternalName'})
+
 
 class ResourceParser:
     """资源解析器 - 专注数据转换和验证"""
@@ -570,10 +574,8 @@ class ResourceParser:
 
             # 检查必需字段
             if isinstance(data, dict):
-                missing_fields = []
-                for field in required_fields:
-                    if field not in data or data[field] is None:
-                        missing_fields.append(field)
+                # 字段缺失与值为None等价，dict.get一次查找即可判断
+                missing_fields = [field for field in required_fields if data.get(field) is None]
 
                 if missing_fields:
                     raise ValueError(f"缺少必需字段: {missing_fields}")
@@ -584,13 +586,11 @@ class ResourceParser:
                     raise ValueError("节点数量必须是非负整数")
 
             elif resource_type == 'pod':
-                valid_phases = ['Pending', 'Running', 'Succeeded', 'Failed', 'Unknown']
-                if data.get('phase') not in valid_phases:
+                if data.get('phase') not in VALID_POD_PHASES:
                     raise ValueError(f"无效的Pod阶段: {data.get('phase')}")
 
             elif resource_type == 'service':
-                valid_types = ['ClusterIP', 'NodePort', 'LoadBalancer', 'ExternalName']
-                if data.get('type') not in valid_types:
+                if data.get('type') not in VALID_SERVICE_TYPES:
                     raise ValueError(f"无效的服务类型: {data.get('type')}")
 
             return True
@@ -8,7 +8,6 @@ import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from dotenv import load_dotenv
 from mcp_use import MCPClient
 
 # 添加项目根目录到Python路径
@@ -21,7 +20,7 @@ from src.scanner.resource_parser import ResourceParser
 from src.scanner.scan_coordinator import ScanCoordinator
 from src.cache import CacheManager
 from src.mcp_tools import MCPToolLoader
-from src.llm_config import create_llm
+from src.llm_config import create_llm, load_env
 
 
 async def demo_cluster_scanning():
@@ -31,7 +30,7 @@ async def demo_cluster_scanning():
     print("=" * 60)
     
     # 加载环境变量
-    load_dotenv()
+    load_env()
     
     try:
         # 1. 初始化组件
@@ -8,7 +8,6 @@ import json
 import os
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-from dotenv import load_dotenv
 from mcp_use import MCPClient, MCPAgent
 
 import sys
@@ -19,7 +18,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / 'src'))
 
-from src.llm_config import create_llm
+from src.llm_config import create_llm, load_env
 from src.cache.cache_manager import CacheManager
 from src.cache.models import MCPToolInfo
 from src.scanner.exceptions import ToolDiscoveryError
@@ -43,7 +42,9 @@ class ToolDiscovery:
         try:
             # 验证环境配置
             required_vars = ["MCP_SERVER_URL", "MCP_SERVER_TYPE", "MCP_SERVER_NAME"]
-            missing_vars = [var for var in required_vars if not os.getenv(var)]
+            # 每个变量只读取一次，校验和创建客户端复用同一份值
+            mcp_env = {var: os.environ.get(var) for var in required_vars}
+            missing_vars = [var for var, value in mcp_env.items() if not value]
             
             if missing_vars:
                 raise ToolDiscoveryError(
@@ -53,9 +54,9 @@ class ToolDiscovery:
             # 创建MCP客户端
             config = {
                 "mcpServers": {
-                    os.getenv("MCP_SERVER_NAME"): {
-                        "type": os.getenv("MCP_SERVER_TYPE"),
-                        "url": os.getenv("MCP_SERVER_URL")
+                    mcp_env["MCP_SERVER_NAME"]: {
+                        "type": mcp_env["MCP_SERVER_TYPE"],
+                        "url": mcp_env["MCP_SERVER_URL"]
                     }
                 }
             }
@@ -332,7 +333,7 @@ class ToolDiscovery:
 
 async def main():
     """主函数 - 执行工具发现"""
-    load_dotenv()
+    load_env()
     
     print("=" * 60)
     print("🛠️ K8s MCP工具发现和缓存系统")
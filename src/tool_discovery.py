@@ -7,7 +7,6 @@ import asyncio
 import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
 from mcp_use import MCPAgent, MCPClient
 
 # 添加项目根目录到 Python 路径（仅在直接运行时）
@@ -15,7 +14,7 @@ if __name__ == "__main__":
     project_root = Path(__file__).parent.parent
     sys.path.insert(0, str(project_root))
 
-from src.llm_config import create_llm
+from src.llm_config import create_llm, load_env
 
 
 async def discover_k8s_tools():
@@ -24,7 +23,7 @@ async def discover_k8s_tools():
     复用 src/main.py 中已验证的配置格式
     """
     # 加载环境变量
-    load_dotenv()
+    load_env()
     
     # 复用已验证的 MCP 配置（无 type 字段）
     server_name = os.getenv("MCP_SERVER_NAME")
@@ -112,7 +111,7 @@ async def get_tool_schema(tool_name: str):
     Args:
         tool_name: 工具名称
     """
-    load_dotenv()
+    load_env()
     
     server_name = os.getenv("MCP_SERVER_NAME")
     server_url = os.getenv("MCP_SERVER_URL")
@@ -168,7 +167,7 @@ def print_usage():
 
 async def get_all_tools_with_schemas():
     """获取所有工具及其 schema"""
-    load_dotenv()
+    load_env()
 
     server_name = os.getenv("MCP_SERVER_NAME")
     server_url = os.getenv("MCP_SERVER_URL")
@@ -12,6 +12,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from llm_config import (
     create_llm,
+    get_config,
     get_model_info,
     print_model_status
 )
@@ -84,6 +85,27 @@ def test_llm_creation():
         return False
 
 
+def test_llm_instance_reuse():
+    """测试LLM实例复用"""
+    print("\n♻️  测试LLM实例复用...")
+
+    try:
+        # 相同参数应返回同一实例
+        assert create_llm() is create_llm(), "默认配置未复用实例"
+        assert create_llm() is get_config().default_llm, "默认配置未返回共享实例"
+        assert create_llm(temperature=0.1) is create_llm(temperature=0.1), "相同覆盖参数未复用实例"
+
+        # 不同参数应创建不同实例
+        assert create_llm() is not create_llm(temperature=0.1), "不同参数错误复用了实例"
+
+        print("✅ LLM实例复用测试成功")
+        return True
+
+    except Exception as e:
+        print(f"❌ LLM实例复用测试失败: {e}")
+        return False
+
+
 def test_k8s_llm_creation():
     """测试Kubernetes专用LLM创建"""
     print("\n⚙️  测试Kubernetes专用LLM创建...")
@@ -180,6 +202,7 @@ def main():
         test_environment_variables,
         test_provider_info,
         test_llm_creation,
+        test_llm_instance_reuse,
         test_k8s_llm_creation
     ]
     
@@ -125,6 +125,49 @@ class TestCapabilityAnalyzer(unittest.TestCase):
         
         print("✅ Pod工具能力分析测试通过")
     
+    def test_analysis_cache_reuse(self) -> None:
+        """测试相同schema的分析结果缓存复用"""
+        tool_data = {
+            'name': 'k8s_get_node',
+            'description': 'Get node details',
+            'input_schema': {
+                'type': 'object',
+                'properties': {'name': {'type': 'string'}},
+                'required': ['name']
+            }
+        }
+        
+        first = self.analyzer.analyze_tool_capabilities(ToolSchema(**tool_data))
+        second = self.analyzer.analyze_tool_capabilities(ToolSchema(**tool_data))
+        
+        self.assertEqual(first, second)
+        self.assertIsNot(first.resource_types, second.resource_types)
+        self.assertEqual(self.analyzer.get_analysis_stats()['cache_hits'], 1)
+        
+        print("✅ 分析结果缓存测试通过")
+    
+    def test_analyze_many(self) -> None:
+        """测试批量分析与逐个分析结果一致"""
+        tool_schemas = [
+            ToolSchema(name='k8s_list_pods', description='List pods', input_schema={'type': 'object'}),
+            ToolSchema(name='get_statefulset', description='', input_schema={'type': 'object'}),
+            ToolSchema(name='k8s_scale', description='Scale a deployment', input_schema={'type': 'object'})
+        ]
+        
+        batch_results = self.analyzer.analyze_many(tool_schemas)
+        single_results = [
+            CapabilityAnalyzer().analyze_tool_capabilities(tool_schema)
+            for tool_schema in tool_schemas
+        ]
+        
+        self.assertEqual(len(batch_results), len(tool_schemas))
+        for batch, single in zip(batch_results, single_results):
+            self.assertEqual(batch.tool_name, single.tool_name)
+            self.assertEqual(set(batch.resource_types), set(single.resource_types))
+            self.assertEqual(batch.scope, single.scope)
+        
+        print("✅ 批量能力分析测试通过")
+    
     def test_infer_resource_types(self) -> None:
         """测试资源类型推断"""
         resource_types = self.analyzer.infer_resource_types(
@@ -152,6 +195,22 @@ class TestCapabilityAnalyzer(unittest.TestCase):
         self.assertIn('create', operation_types)
         
         print("✅ 操作类型推断测试通过")
+    
+    def test_infer_types_overlapping_keywords(self) -> None:
+        """测试关键词重叠及大小写不敏感匹配"""
+        resource_types = self.analyzer.infer_resource_types('K8S_LIST_CRONJOBS', '')
+        
+        self.assertIn('cronjob', resource_types)
+        self.assertIn('job', resource_types)
+        
+        operation_types = self.analyzer.infer_operation_types(
+            'EXECUTE_SHELL',
+            {'type': 'object', 'properties': {'tailLines': {'type': 'integer'}}}
+        )
+        
+        self.assertEqual(set(operation_types), {'exec', 'logs'})
+        
+        print("✅ 关键词重叠匹配测试通过")
 
 
 class TestToolSelector(unittest.TestCase):